@@ -1,20 +1,80 @@
 from asaas import (
+    columnar,
     customer,
+    lazy,
     payments,
+    status,
     subscriptions
 )
 from asaas.utils import remove_none_and_empty_values
-from asaas.exceptions import raise_for_status
+from asaas.exceptions import (
+    AsaasError,
+    raise_for_status
+)
+from asaas.ratelimit import (
+    RateLimiter,
+    rate_limit_delay
+)
+from asaas.retry import Retry
+from asaas.metrics import (
+    Metrics,
+    endpoint_template,
+    timed_conversion
+)
+from asaas.hooks import (
+    HOOKS,
+    RequestTiming,
+    connection_phases,
+    dispatch_hook,
+    log_slow_call,
+    normalize_hooks,
+    reset_connection_phases
+)
+from asaas.transport import (
+    RequestsTransport,
+    Transport
+)
+from asaas.json_backend import (
+    JSONBackend,
+    get_backend
+)
+from asaas.singleflight import SingleFlight
+from asaas.streaming import iter_list_items
+from asaas.bulk import (
+    BulkResult,
+    run_bulk
+)
+from asaas.cache import ResourceCache
+from asaas.idempotency import (
+    IDEMPOTENCY_HEADER,
+    IdempotencyStore,
+    generate_idempotency_key
+)
 
 import requests
 
+import time
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
     Optional,
-    List
+    List,
+    Union
 )
 
 from datetime import date
 
+MAX_PAGE_SIZE = 100
+STREAM_CHUNK_SIZE = 16384
+
 
 class Asaas:
     """SDK for Asaas API"""
@@ -22,48 +82,596 @@ class Asaas:
     def __init__(
         self,
         api_key: str,
-        production: bool = False
+        production: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_retries: int = 3,
+        retry: Optional[Retry] = None,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        cache: Optional[ResourceCache] = None,
+        coalesce_gets: bool = False,
+        lazy_models: bool = False,
+        json_backend: Union[str, JSONBackend] = 'json',
+        timeout: Optional[float] = None,
+        metrics: Optional[Metrics] = None,
+        hooks: Optional[Dict[str, Union[Callable, List[Callable]]]] = None,
+        slow_call_threshold: Optional[float] = None,
+        transport: Optional[Transport] = None
     ):
         self.base_url = 'https://www.asaas.com/api/v3' if production else 'https://sandbox.asaas.com/api/v3'
         self.headers = {
             'access_token': api_key
         }
 
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.retry = retry
+        self.idempotency_store = idempotency_store if idempotency_store is not None else IdempotencyStore()
+        self.single_flight = SingleFlight() if coalesce_gets else None
+        self.cache = cache
+        self.lazy_models = lazy_models
+        self.json_backend = get_backend(json_backend)
+        self.metrics = metrics
+        self.hooks = normalize_hooks(hooks)
+        self.slow_call_threshold = slow_call_threshold
+        self.timeout = timeout
+
+        self.transport = transport if transport is not None else RequestsTransport(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+
         self.customers = Costumers(self)
         self.payments = Payments(self)
         self.subscriptions = Subscriptions(self)
 
+    def __enter__(self) -> 'Asaas':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def session(self) -> Optional[requests.Session]:
+        """Session of the requests transport bound to the current thread
+
+        None when the client uses another transport.
+        """
+
+        return getattr(self.transport, 'session', None)
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+
+        self.transport.close()
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
+        remember: bool = True
+    ) -> requests.Response:
+        """Make a request to Asaas API
+
+        A request sent with an idempotency key is remembered in the idempotency
+        store, and replaying the same key returns the original response
+        instead of writing again. Keys generated by the SDK itself are sent
+        with remember=False, since nobody can replay them.
+        """
+
+        if idempotency_key is None or not remember:
+            return self.send(method, endpoint, params, data, idempotency_key)
+
+        with self.idempotency_store.lock(idempotency_key):
+            stored = self.idempotency_store.get(idempotency_key)
+
+            if stored is not None:
+                return stored.to_requests()
+
+            response = self.send(method, endpoint, params, data, idempotency_key)
+            self.idempotency_store.set(idempotency_key, response)
+
+        return response
+
+    def send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """Make a request to Asaas API through the connection pool
+
+        Every request takes a token from the rate limiter, if any. On HTTP 429
+        the request is repeated up to rate_limit_retries times, after waiting
+        for Retry-After, and the shared limiter is paused for that long too.
+        Transient failures are retried according to the retry policy.
+
+        With stream, the body is left unread on the connection and the caller
+        must close the response.
+        """
+
+        headers = dict(self.headers)
+        body = None
+
+        if idempotency_key:
+            headers[IDEMPOTENCY_HEADER] = idempotency_key
+
+        if data is not None:
+            headers['Content-Type'] = 'application/json'
+            body = self.json_backend.dumps(data)
+
+        idempotent = idempotency_key is not None
+        attempt = 0
+        rate_limited = 0
+        metrics = self.metrics
+        template = endpoint_template(endpoint) if metrics is not None else None
+        url = f'{self.base_url}/{endpoint}/'
+        timing = RequestTiming(method, endpoint, url)
+
+        dispatch_hook(self.hooks, 'before_request', timing)
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            reset_connection_phases()
+            timing.attempts += 1
+            started = time.perf_counter()
+
+            try:
+                response = self.transport.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    data=body,
+                    timeout=self.timeout,
+                    stream=stream
+                )
+
+            except Exception as error:
+                delay = self.retry.delay_for_exception(
+                    method, attempt, error, idempotent) if self.retry else None
+
+                if metrics is not None:
+                    metrics.record_error(method, template, error)
+
+                if delay is None:
+                    self.fail(timing, error)
+
+                    raise
+
+                if metrics is not None:
+                    metrics.record_retry(method, template, type(error).__name__)
+
+                attempt += 1
+                time.sleep(delay)
+
+                continue
+
+            duration = time.perf_counter() - started
+            self.time_phases(timing, response, duration, stream)
+
+            if metrics is not None:
+                metrics.record_request(method, template, response.status_code, duration)
+
+            if response.status_code == status.HTTP_429_TOO_MANY_REQUESTS and rate_limited < self.rate_limit_retries:
+                delay = rate_limit_delay(response, rate_limited)
+                rate_limited += 1
+
+                if metrics is not None:
+                    metrics.record_retry(method, template, str(response.status_code))
+
+                response.close()
+
+                if self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+
+                continue
+
+            delay = self.retry.delay_for_status(
+                method, attempt, response, idempotent) if self.retry else None
+
+            if delay is None:
+                break
+
+            if metrics is not None:
+                metrics.record_retry(method, template, str(response.status_code))
+
+            attempt += 1
+            response.close()
+            time.sleep(delay)
+
+        response.timing = timing
+        timing.stop()
+        dispatch_hook(self.hooks, 'after_response', response, timing)
+
+        try:
+            raise_for_status(response)
+
+        except AsaasError as error:
+            if metrics is not None:
+                metrics.record_error(method, template, error)
+
+            self.fail(timing, error)
+
+            raise
+
+        log_slow_call(timing, self.slow_call_threshold)
+
+        return response
+
+    def time_phases(
+        self,
+        timing: RequestTiming,
+        response: requests.Response,
+        duration: float,
+        stream: bool
+    ) -> None:
+        """Split the duration of an attempt into connection, server and download phases"""
+
+        timing.status_code = response.status_code
+        timing.connect = connection_phases.connect
+        timing.tls = connection_phases.tls
+
+        elapsed = response.elapsed.total_seconds()
+        timing.server = max(elapsed - (timing.connect or 0) - (timing.tls or 0), 0)
+        timing.download = None if stream else max(duration - elapsed, 0)
+
+    def fail(
+        self,
+        timing: RequestTiming,
+        error: Exception
+    ) -> None:
+        """Report a failed call to the on_error hooks and the slow-call log"""
+
+        timing.error = error
+        timing.stop()
+        dispatch_hook(self.hooks, 'on_error', error, timing)
+        log_slow_call(timing, self.slow_call_threshold)
+
+    def register_hook(
+        self,
+        event: str,
+        hook: Callable
+    ) -> None:
+        """Call hook on a lifecycle event
+
+        before_request(timing), after_response(response, timing),
+        on_error(error, timing) and after_parse(result, timing), where timing
+        is the RequestTiming of the call.
+        """
+
+        if event not in self.hooks:
+            raise ValueError(f'Unknown hook {event!r}, expected one of {", ".join(HOOKS)}')
+
+        self.hooks[event].append(hook)
+
+    def decode(
+        self,
+        response: requests.Response,
+        timing: Optional[RequestTiming] = None
+    ) -> Any:
+        """Decode a JSON response body with the configured backend"""
+
+        started = time.perf_counter()
+        data = self.json_backend.loads(response.content)
+        duration = time.perf_counter() - started
+
+        if self.metrics is not None:
+            self.metrics.record_parse('json', duration)
+
+        if timing is not None:
+            timing.decode = duration
+
+        return data
+
+    def parse_timing(
+        self,
+        response: requests.Response
+    ) -> Optional[RequestTiming]:
+        """Timing to fill while parsing a response
+
+        A response shared by coalesced GETs or replayed for an idempotency
+        key was timed by the call that sent it; later parses get a timing of
+        their own, holding only their decode and convert phases.
+        """
+
+        timing = getattr(response, 'timing', None)
+
+        if timing is None or timing.claim():
+            return timing
+
+        shared = RequestTiming(timing.method, timing.endpoint, timing.url)
+        shared.status_code = timing.status_code
+
+        return shared
+
+    def convert(
+        self,
+        data: Any,
+        converter: Callable[[dict], object],
+        many: bool,
+        timing: Optional[RequestTiming]
+    ) -> Any:
+        """Convert decoded data, or each item of its data when many
+
+        Fills the convert phase of the timing and runs the after_parse hooks.
+        """
+
+        started = time.perf_counter()
+
+        if many:
+            result = [converter(item) for item in data['data']]
+        else:
+            result = converter(data)
+
+        if timing is not None:
+            timing.convert = time.perf_counter() - started
+            timing.stop()
+            dispatch_hook(self.hooks, 'after_parse', result, timing)
+            log_slow_call(timing, self.slow_call_threshold)
+
+        return result
+
+    def parse(
+        self,
+        response: requests.Response,
+        converter: Callable[[dict], object],
+        many: bool = False
+    ) -> Any:
+        """Decode a response and convert it, or each item of its data when many
+
+        Fills the decode and convert phases of the call timing and runs the
+        after_parse hooks.
+        """
+
+        timing = self.parse_timing(response)
+
+        return self.convert(self.decode(response, timing), converter, many, timing)
+
+    def cached(
+        self,
+        endpoint: str,
+        key: str,
+        load: Callable[[], object]
+    ) -> object:
+        """Serve a retrieve from the cache, when one is configured"""
+
+        if self.cache is None:
+            return load()
+
+        return self.cache.get_or_load(endpoint, key, load)
+
+    def cache_write(
+        self,
+        endpoint: str,
+        key: str,
+        model: Optional[object] = None
+    ) -> None:
+        """Refresh a cached model after a write, or drop it when no model is given"""
+
+        if self.cache is None:
+            return
+
+        if model is None:
+            self.cache.invalidate(endpoint, key)
+        else:
+            self.cache.set(endpoint, key, model)
+
+    def fetch_page(
+        self,
+        endpoint: str,
+        params: dict,
+        offset: int,
+        limit: int,
+        converter: Optional[Callable[[dict], object]] = None
+    ) -> dict:
+        """Fetch a single page of a list endpoint
+
+        With a converter, data holds the converted items, parsed through the
+        same timing and after_parse hooks as single objects.
+        """
+
+        response = self.get(
+            endpoint,
+            {**params, 'offset': offset, 'limit': limit}
+        )
+        timing = self.parse_timing(response)
+        page = self.decode(response, timing)
+
+        if converter is not None:
+            page['data'] = self.convert(page, converter, True, timing)
+
+        return page
+
+    def stream_list(
+        self,
+        endpoint: str,
+        params: dict,
+        converter: Callable[[dict], object],
+        meta: Optional[dict] = None
+    ) -> Iterator:
+        """Iterate over the items of a single list page as they arrive
+
+        The body is read from the socket in chunks and each item of data is
+        decoded and converted on its own, so the whole page is never held in
+        memory. The other page fields (hasMore, totalCount...) are stored in
+        meta. Streamed pages are always decoded by the standard json module.
+        """
+
+        response = self.send('GET', endpoint, params, stream=True)
+
+        try:
+            for item in iter_list_items(response.iter_content(STREAM_CHUNK_SIZE), meta=meta):
+                yield converter(item)
+
+        finally:
+            response.close()
+
+    def stream_pages(
+        self,
+        endpoint: str,
+        params: dict,
+        converter: Callable[[dict], object],
+        page_size: int = MAX_PAGE_SIZE,
+        offset: int = 0
+    ) -> Iterator:
+        """Iterate over every item of a list endpoint, streaming each page"""
+
+        while True:
+            meta = {}
+            count = 0
+
+            for item in self.stream_list(
+                endpoint,
+                {**params, 'offset': offset, 'limit': page_size},
+                converter,
+                meta
+            ):
+                count += 1
+                yield item
+
+            if not meta.get('hasMore') or not count:
+                return
+
+            offset += count
+
+    def paginate(
+        self,
+        endpoint: str,
+        params: dict,
+        converter: Callable[[dict], object],
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None,
+        offset: int = 0,
+        stream: bool = False
+    ) -> Iterator:
+        """Iterate over every item of a list endpoint, one page at a time
+
+        With concurrency above one, the pages after the first are fetched by
+        a pool of that many threads once totalCount is known, keeping up to
+        prefetch pages (twice the concurrency by default) in flight ahead of
+        the consumer. Items are always yielded in order. page_size is capped
+        at MAX_PAGE_SIZE, the most the API returns per page.
+
+        With stream, pages are fetched one at a time and parsed incrementally
+        (see stream_list), and concurrency is ignored.
+        """
+
+        page_size = min(page_size, MAX_PAGE_SIZE)
+
+        if stream:
+            yield from self.stream_pages(endpoint, params, converter, page_size, offset)
+
+            return
+
+        page = self.fetch_page(endpoint, params, offset, page_size, converter)
+
+        while True:
+            yield from page['data']
+
+            if not page.get('hasMore') or not page['data']:
+                return
+
+            if concurrency > 1 and page.get('totalCount'):
+                break
+
+            offset += len(page['data'])
+            page = self.fetch_page(endpoint, params, offset, page_size, converter)
+
+        # The API caps limit, so later pages are planned with the size of the
+        # first full page rather than the size asked for
+        step = len(page['data'])
+        offsets = iter(range(offset + step, page['totalCount'], step))
+        window = max(prefetch or concurrency * 2, 1)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                for next_offset in islice(offsets, window):
+                    pending.append((next_offset, executor.submit(
+                        self.fetch_page, endpoint, params, next_offset, page_size, converter
+                    )))
+
+                while pending:
+                    offset, future = pending.popleft()
+                    page = future.result()
+                    # A short page before the end (items deleted while scanning)
+                    # means the planned offsets would skip rows from here on
+                    short = page.get('hasMore') and len(page['data']) < step
+
+                    if not short:
+                        for next_offset in islice(offsets, 1):
+                            pending.append((next_offset, executor.submit(
+                                self.fetch_page, endpoint, params, next_offset, page_size, converter
+                            )))
+
+                    yield from page['data']
+
+                    if short:
+                        break
+
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+        # Items created while scanning push totalCount past the planned offsets,
+        # and a short page stops the plan; either way the rest is read serially
+        if page.get('hasMore') and page['data']:
+            yield from self.paginate(
+                endpoint,
+                params,
+                converter,
+                page_size,
+                offset=offset + len(page['data'])
+            )
+
     def get(
         self,
         endpoint: str,
         params: Optional[dict] = None
     ) -> requests.Response:
-        """Make a GET request to Asaas API"""
+        """Make a GET request to Asaas API
 
-        response = requests.get(
-            f'{self.base_url}/{endpoint}/',
-            headers=self.headers,
-            params=params
-        )
-        raise_for_status(response)
+        With coalesce_gets, concurrent GETs for the same endpoint and params
+        share a single request and its response.
+        """
 
-        return response
+        if self.single_flight is None:
+            return self.request('GET', endpoint, params=params)
+
+        return self.single_flight.do(
+            (endpoint, tuple(sorted((params or {}).items()))),
+            lambda: self.request('GET', endpoint, params=params)
+        )
 
     def post(
         self,
         endpoint: str,
-        data: dict
+        data: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
+        remember: bool = True
     ) -> requests.Response:
         """Make a POST request to Asaas API"""
 
-        response = requests.post(
-            f'{self.base_url}/{endpoint}/',
-            headers=self.headers,
-            json=data
-        )
-        raise_for_status(response)
-
-        return response
+        return self.request('POST', endpoint, data=data, idempotency_key=idempotency_key, remember=remember)
 
     def put(
         self,
@@ -72,14 +680,7 @@ class Asaas:
     ) -> requests.Response:
         """Make a PUT request to Asaas API"""
 
-        response = requests.put(
-            f'{self.base_url}/{endpoint}/',
-            headers=self.headers,
-            json=data
-        )
-        raise_for_status(response)
-
-        return response
+        return self.request('PUT', endpoint, data=data)
 
     def delete(
         self,
@@ -87,38 +688,54 @@ class Asaas:
     ) -> requests.Response:
         """Make a DELETE request to Asaas API"""
 
-        response = requests.delete(
-            f'{self.base_url}/{endpoint}/',
-            headers=self.headers
-        )
-        raise_for_status(response)
+        return self.request('DELETE', endpoint)
 
-        return response
 
+class ResponseDataConverter:
+    asaas = None
 
-class Costumers:
-    """Class to manage customers in Asaas API"""
+    @property
+    def lazy_models(self) -> bool:
+        """Whether responses become lazy views instead of eagerly built models"""
 
-    def __init__(self, asaas: Asaas):
-        self.asaas = asaas
-        self.endpoint = 'customers'
-        
-    
+        return self.asaas is not None and self.asaas.lazy_models
+
+
+class ResponseDataToCustomer(ResponseDataConverter):
+    @timed_conversion('customer')
     def response_data_to_customer(
         self,
         data: dict
     ):
+        """Convert response data to Customer object"""
+
+        if self.lazy_models:
+            return lazy.LazyCustomer(data)
+
         return customer.Customer(**data)
 
+
+class Costumers(ResponseDataToCustomer):
+    """Class to manage customers in Asaas API"""
+
+    def __init__(self, asaas: Asaas):
+        self.asaas = asaas
+        self.endpoint = 'customers'
+
     def retrieve(
         self,
         customer_id: str
     ) -> customer.Customer:
         """Retrieve a customer by ID"""
 
-        response = self.asaas.get(f'{self.endpoint}/{customer_id}')
-
-        return self.response_data_to_customer(response.json())
+        return self.asaas.cached(
+            self.endpoint,
+            customer_id,
+            lambda: self.asaas.parse(
+                self.asaas.get(f'{self.endpoint}/{customer_id}'),
+                self.response_data_to_customer
+            )
+        )
 
     def create(
         self,
@@ -139,7 +756,8 @@ class Costumers:
         stateInscription: Optional[str] = None,
         observations: Optional[str] = None,
         groupName: Optional[str] = None,
-        company: Optional[str] = None
+        company: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> customer.Customer:
         """Create a new customer"""
 
@@ -166,9 +784,14 @@ class Costumers:
             }
         )
 
-        response = self.asaas.post(f'{self.endpoint}', data)
+        response = self.asaas.post(
+            f'{self.endpoint}',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
 
-        return self.response_data_to_customer(response.json())
+        return self.asaas.parse(response, self.response_data_to_customer)
 
     def list(
         self,
@@ -196,7 +819,39 @@ class Costumers:
 
         response = self.asaas.get(self.endpoint, params)
 
-        return [self.response_data_to_customer(customer_dict) for customer_dict in response.json()['data']]
+        return self.asaas.parse(response, self.response_data_to_customer, many=True)
+
+    def iter_all(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        cpfCnpj: Optional[str] = None,
+        groupName: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None
+    ) -> Iterator[customer.Customer]:
+        """Iterate over every customer, fetching pages lazily"""
+
+        params = remove_none_and_empty_values(
+            {
+                'name': name,
+                'email': email,
+                'cpfCnpj': cpfCnpj,
+                'groupName': groupName,
+                'externalReference': externalReference
+            }
+        )
+
+        return self.asaas.paginate(
+            self.endpoint,
+            params,
+            self.response_data_to_customer,
+            page_size,
+            concurrency,
+            prefetch
+        )
 
     def update(
         self,
@@ -250,7 +905,10 @@ class Costumers:
             data
         )
 
-        return self.response_data_to_customer(response.json())
+        result = self.asaas.parse(response, self.response_data_to_customer)
+        self.asaas.cache_write(self.endpoint, customer_id, result)
+
+        return result
 
     def delete(
         self,
@@ -259,6 +917,7 @@ class Costumers:
         """Delete a customer by ID"""
 
         self.asaas.delete(f'customers/{customer_id}')
+        self.asaas.cache_write(self.endpoint, customer_id)
 
     def restore(
         self,
@@ -268,16 +927,25 @@ class Costumers:
 
         response = self.asaas.post(f'{self.endpoint}/{customer_id}/restore')
 
-        return self.response_data_to_customer(response.json())
+        result = self.asaas.parse(response, self.response_data_to_customer)
+        self.asaas.cache_write(self.endpoint, customer_id, result)
+
+        return result
 
 
-class ResponseDataToPayment:
+class ResponseDataToPayment(ResponseDataConverter):
+    @timed_conversion('payment')
     def response_data_to_payment(
         self,
         data: dict
     ):
         """Convert response data to Payment object"""
 
+        if self.lazy_models:
+            return lazy.LazyPayment(data)
+
+        data = dict(data)
+
         data['discount'] = payments.Discount(
             **data['discount']
         ) if data.get('discount') else None
@@ -317,9 +985,14 @@ class Payments(ResponseDataToPayment):
     ) -> payments.Payment:
         """Retrieve a payment by ID"""
 
-        response = self.asaas.get(f'{self.endpoint}/{payment_id}')
-
-        return self.response_data_to_payment(response.json())
+        return self.asaas.cached(
+            self.endpoint,
+            payment_id,
+            lambda: self.asaas.parse(
+                self.asaas.get(f'{self.endpoint}/{payment_id}'),
+                self.response_data_to_payment
+            )
+        )
 
     def create(
         self,
@@ -338,7 +1011,8 @@ class Payments(ResponseDataToPayment):
         fine: Optional[payments.Fine] = None,
         postalService: Optional[bool] = None,
         split: Optional[List[payments.Split]] = None,
-        callback: Optional[payments.Callback] = None
+        callback: Optional[payments.Callback] = None,
+        idempotency_key: Optional[str] = None
     ) -> payments.Payment:
         discount = discount.to_dict() if discount else None
         interest = interest.to_dict() if interest else None
@@ -367,9 +1041,36 @@ class Payments(ResponseDataToPayment):
             }
         )
 
-        response = self.asaas.post(f'{self.endpoint}', data)
+        response = self.asaas.post(
+            f'{self.endpoint}',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
 
-        return self.response_data_to_payment(response.json())
+        return self.asaas.parse(response, self.response_data_to_payment)
+
+    def create_many(
+        self,
+        items: Iterable[dict],
+        concurrency: int = 4,
+        fail_fast: bool = False,
+        progress: Optional[Callable[[int, BulkResult], None]] = None
+    ) -> Iterator[BulkResult]:
+        """Create payments concurrently, yielding one BulkResult per item in input order
+
+        Each item holds the keyword arguments of create(), including Discount,
+        Interest, Fine, Split and Callback objects and an optional
+        idempotency_key.
+        """
+
+        return run_bulk(
+            lambda item: self.create(**item),
+            items,
+            concurrency,
+            fail_fast,
+            progress
+        )
 
     def list(
         self,
@@ -429,7 +1130,277 @@ class Payments(ResponseDataToPayment):
 
         response = self.asaas.get(self.endpoint, params)
 
-        return [self.response_data_to_payment(payment) for payment in response.json()['data']]
+        return self.asaas.parse(response, self.response_data_to_payment, many=True)
+
+    def list_stream(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[payments.BillingType] = None,
+        status: Optional[payments.Status] = None,
+        subscription: Optional[str] = None,
+        installment: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        paymentDate: Optional[date] = None,
+        invoiceStatus: Optional[str] = None,
+        estimatedCreditDate: Optional[date] = None,
+        pixQrCodeId: Optional[str] = None,
+        antipated: Optional[bool] = None,
+        dateCreatedGreaterThanOrEqual: Optional[date] = None,
+        dateCreatedLessThanOrEqual: Optional[date] = None,
+        paymentDateGreaterThanOrEqual: Optional[date] = None,
+        paymentDateLessThanOrEqual: Optional[date] = None,
+        estimatedCreditDateGreaterThanOrEqual: Optional[date] = None,
+        estimatedCreditDateLessThanOrEqual: Optional[date] = None,
+        dueDateGreaterThanOrEqual: Optional[date] = None,
+        dueDateLessThanOrEqual: Optional[date] = None,
+        user: Optional[str] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[payments.Payment]:
+        """List payments, yielding each one as soon as it is parsed
+
+        Unlike list, the page is decoded incrementally from the response
+        stream, so the first payment is available before the whole body has
+        arrived and only one item is held in memory at a time.
+        """
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'subscription': subscription,
+                'installment': installment,
+                'externalReference': externalReference,
+                'paymentDate': paymentDate,
+                'invoiceStatus': invoiceStatus,
+                'estimatedCreditDate': estimatedCreditDate,
+                'pixQrCodeId': pixQrCodeId,
+                'antipated': antipated,
+                'dateCreatedGreaterThanOrEqual': dateCreatedGreaterThanOrEqual,
+                'dateCreatedLessThanOrEqual': dateCreatedLessThanOrEqual,
+                'paymentDateGreaterThanOrEqual': paymentDateGreaterThanOrEqual,
+                'paymentDateLessThanOrEqual': paymentDateLessThanOrEqual,
+                'estimatedCreditDateGreaterThanOrEqual': estimatedCreditDateGreaterThanOrEqual,
+                'estimatedCreditDateLessThanOrEqual': estimatedCreditDateLessThanOrEqual,
+                'dueDateGreaterThanOrEqual': dueDateGreaterThanOrEqual,
+                'dueDateLessThanOrEqual': dueDateLessThanOrEqual,
+                'user': user,
+                'offset': offset,
+                'limit': limit
+            }
+        )
+
+        return self.asaas.stream_list(self.endpoint, params, self.response_data_to_payment)
+
+    def iter_all(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[payments.BillingType] = None,
+        status: Optional[payments.Status] = None,
+        subscription: Optional[str] = None,
+        installment: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        paymentDate: Optional[date] = None,
+        invoiceStatus: Optional[str] = None,
+        estimatedCreditDate: Optional[date] = None,
+        pixQrCodeId: Optional[str] = None,
+        antipated: Optional[bool] = None,
+        dateCreatedGreaterThanOrEqual: Optional[date] = None,
+        dateCreatedLessThanOrEqual: Optional[date] = None,
+        paymentDateGreaterThanOrEqual: Optional[date] = None,
+        paymentDateLessThanOrEqual: Optional[date] = None,
+        estimatedCreditDateGreaterThanOrEqual: Optional[date] = None,
+        estimatedCreditDateLessThanOrEqual: Optional[date] = None,
+        dueDateGreaterThanOrEqual: Optional[date] = None,
+        dueDateLessThanOrEqual: Optional[date] = None,
+        user: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None,
+        stream: bool = False
+    ) -> Iterator[payments.Payment]:
+        """Iterate over every payment, fetching pages lazily"""
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'subscription': subscription,
+                'installment': installment,
+                'externalReference': externalReference,
+                'paymentDate': paymentDate,
+                'invoiceStatus': invoiceStatus,
+                'estimatedCreditDate': estimatedCreditDate,
+                'pixQrCodeId': pixQrCodeId,
+                'antipated': antipated,
+                'dateCreatedGreaterThanOrEqual': dateCreatedGreaterThanOrEqual,
+                'dateCreatedLessThanOrEqual': dateCreatedLessThanOrEqual,
+                'paymentDateGreaterThanOrEqual': paymentDateGreaterThanOrEqual,
+                'paymentDateLessThanOrEqual': paymentDateLessThanOrEqual,
+                'estimatedCreditDateGreaterThanOrEqual': estimatedCreditDateGreaterThanOrEqual,
+                'estimatedCreditDateLessThanOrEqual': estimatedCreditDateLessThanOrEqual,
+                'dueDateGreaterThanOrEqual': dueDateGreaterThanOrEqual,
+                'dueDateLessThanOrEqual': dueDateLessThanOrEqual,
+                'user': user
+            }
+        )
+
+        return self.asaas.paginate(
+            self.endpoint,
+            params,
+            self.response_data_to_payment,
+            page_size,
+            concurrency,
+            prefetch,
+            stream=stream
+        )
+
+    def to_batch(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[payments.BillingType] = None,
+        status: Optional[payments.Status] = None,
+        subscription: Optional[str] = None,
+        installment: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        paymentDate: Optional[date] = None,
+        invoiceStatus: Optional[str] = None,
+        estimatedCreditDate: Optional[date] = None,
+        pixQrCodeId: Optional[str] = None,
+        antipated: Optional[bool] = None,
+        dateCreatedGreaterThanOrEqual: Optional[date] = None,
+        dateCreatedLessThanOrEqual: Optional[date] = None,
+        paymentDateGreaterThanOrEqual: Optional[date] = None,
+        paymentDateLessThanOrEqual: Optional[date] = None,
+        estimatedCreditDateGreaterThanOrEqual: Optional[date] = None,
+        estimatedCreditDateLessThanOrEqual: Optional[date] = None,
+        dueDateGreaterThanOrEqual: Optional[date] = None,
+        dueDateLessThanOrEqual: Optional[date] = None,
+        user: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None,
+        stream: bool = False
+    ) -> columnar.PaymentBatch:
+        """Load every payment into a columnar PaymentBatch
+
+        Raw page items go straight into the numpy columns, without building a
+        Payment for each row. Requires numpy.
+        """
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'subscription': subscription,
+                'installment': installment,
+                'externalReference': externalReference,
+                'paymentDate': paymentDate,
+                'invoiceStatus': invoiceStatus,
+                'estimatedCreditDate': estimatedCreditDate,
+                'pixQrCodeId': pixQrCodeId,
+                'antipated': antipated,
+                'dateCreatedGreaterThanOrEqual': dateCreatedGreaterThanOrEqual,
+                'dateCreatedLessThanOrEqual': dateCreatedLessThanOrEqual,
+                'paymentDateGreaterThanOrEqual': paymentDateGreaterThanOrEqual,
+                'paymentDateLessThanOrEqual': paymentDateLessThanOrEqual,
+                'estimatedCreditDateGreaterThanOrEqual': estimatedCreditDateGreaterThanOrEqual,
+                'estimatedCreditDateLessThanOrEqual': estimatedCreditDateLessThanOrEqual,
+                'dueDateGreaterThanOrEqual': dueDateGreaterThanOrEqual,
+                'dueDateLessThanOrEqual': dueDateLessThanOrEqual,
+                'user': user
+            }
+        )
+
+        return columnar.PaymentBatch.from_items(self.asaas.paginate(
+            self.endpoint,
+            params,
+            lambda payment: payment,
+            page_size,
+            concurrency,
+            prefetch,
+            stream=stream
+        ))
+
+    def iter_batches(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[payments.BillingType] = None,
+        status: Optional[payments.Status] = None,
+        subscription: Optional[str] = None,
+        installment: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        paymentDate: Optional[date] = None,
+        invoiceStatus: Optional[str] = None,
+        estimatedCreditDate: Optional[date] = None,
+        pixQrCodeId: Optional[str] = None,
+        antipated: Optional[bool] = None,
+        dateCreatedGreaterThanOrEqual: Optional[date] = None,
+        dateCreatedLessThanOrEqual: Optional[date] = None,
+        paymentDateGreaterThanOrEqual: Optional[date] = None,
+        paymentDateLessThanOrEqual: Optional[date] = None,
+        estimatedCreditDateGreaterThanOrEqual: Optional[date] = None,
+        estimatedCreditDateLessThanOrEqual: Optional[date] = None,
+        dueDateGreaterThanOrEqual: Optional[date] = None,
+        dueDateLessThanOrEqual: Optional[date] = None,
+        user: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None,
+        stream: bool = False,
+        batch_size: int = 10000
+    ) -> Iterator[columnar.PaymentBatch]:
+        """Iterate over every payment in columnar batches of batch_size rows
+
+        Like to_batch, but only one batch is held at a time, for aggregates
+        over accounts too large to load at once. Requires numpy.
+        """
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'subscription': subscription,
+                'installment': installment,
+                'externalReference': externalReference,
+                'paymentDate': paymentDate,
+                'invoiceStatus': invoiceStatus,
+                'estimatedCreditDate': estimatedCreditDate,
+                'pixQrCodeId': pixQrCodeId,
+                'antipated': antipated,
+                'dateCreatedGreaterThanOrEqual': dateCreatedGreaterThanOrEqual,
+                'dateCreatedLessThanOrEqual': dateCreatedLessThanOrEqual,
+                'paymentDateGreaterThanOrEqual': paymentDateGreaterThanOrEqual,
+                'paymentDateLessThanOrEqual': paymentDateLessThanOrEqual,
+                'estimatedCreditDateGreaterThanOrEqual': estimatedCreditDateGreaterThanOrEqual,
+                'estimatedCreditDateLessThanOrEqual': estimatedCreditDateLessThanOrEqual,
+                'dueDateGreaterThanOrEqual': dueDateGreaterThanOrEqual,
+                'dueDateLessThanOrEqual': dueDateLessThanOrEqual,
+                'user': user
+            }
+        )
+
+        return columnar.iter_batches(self.asaas.paginate(
+            self.endpoint,
+            params,
+            lambda payment: payment,
+            page_size,
+            concurrency,
+            prefetch,
+            stream=stream
+        ), batch_size)
 
     def update(
         self,
@@ -459,7 +1430,7 @@ class Payments(ResponseDataToPayment):
 
         data = remove_none_and_empty_values(
             {
-                'billingType': billingType.value,
+                'billingType': billingType.value if billingType else None,
                 'value': value,
                 'dueDate': dueDate.strftime('%Y-%m-%d') if dueDate else None,
                 'description': description,
@@ -482,7 +1453,10 @@ class Payments(ResponseDataToPayment):
             data
         )
 
-        return self.response_data_to_payment(response.json())
+        result = self.asaas.parse(response, self.response_data_to_payment)
+        self.asaas.cache_write(self.endpoint, payment_id, result)
+
+        return result
 
     def delete(
         self,
@@ -491,6 +1465,7 @@ class Payments(ResponseDataToPayment):
         """Delete a payment by ID"""
 
         self.asaas.delete(f'payments/{payment_id}')
+        self.asaas.cache_write(self.endpoint, payment_id)
 
     def restore(
         self,
@@ -500,7 +1475,10 @@ class Payments(ResponseDataToPayment):
 
         response = self.asaas.post(f'{self.endpoint}/{payment_id}/restore')
 
-        return self.response_data_to_payment(response.json())
+        result = self.asaas.parse(response, self.response_data_to_payment)
+        self.asaas.cache_write(self.endpoint, payment_id, result)
+
+        return result
 
     def retrieve_status(
         self,
@@ -510,13 +1488,14 @@ class Payments(ResponseDataToPayment):
 
         response = self.asaas.get(f'{self.endpoint}/{payment_id}/status')
 
-        return response.json()['status']
+        return self.asaas.parse(response, lambda data: data['status'])
 
     def refund(
         self,
         payment_id: str,
         value: Optional[float] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> payments.Payment:
         """payments.Refund a payment by ID"""
 
@@ -528,24 +1507,31 @@ class Payments(ResponseDataToPayment):
         )
 
         response = self.asaas.post(
-            f'{self.endpoint}/{payment_id}/refund', data)
+            f'{self.endpoint}/{payment_id}/refund',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
 
-        return self.response_data_to_payment(response.json())
+        result = self.asaas.parse(response, self.response_data_to_payment)
+        self.asaas.cache_write(self.endpoint, payment_id, result)
 
+        return result
 
-class Subscriptions(ResponseDataToPayment):
-    """Class to manage subscriptions in Asaas API"""
-
-    def __init__(self, asaas: Asaas):
-        self.asaas = asaas
-        self.endpoint = 'subscriptions'
 
+class ResponseDataToSubscription(ResponseDataToPayment):
+    @timed_conversion('subscription')
     def response_data_to_subscription(
         self,
         data: dict
     ):
         """Convert response data to Subscription object"""
 
+        if self.lazy_models:
+            return lazy.LazySubscription(data)
+
+        data = dict(data)
+
         data['discount'] = payments.Discount(
             **data['discount']
         ) if data.get('discount') else None
@@ -564,15 +1550,28 @@ class Subscriptions(ResponseDataToPayment):
 
         return subscriptions.Subscription(**data)
 
+
+class Subscriptions(ResponseDataToSubscription):
+    """Class to manage subscriptions in Asaas API"""
+
+    def __init__(self, asaas: Asaas):
+        self.asaas = asaas
+        self.endpoint = 'subscriptions'
+
     def retrieve(
         self,
         subscription_id: str
     ) -> subscriptions.Subscription:
         """Retrieve a subscription by ID"""
 
-        response = self.asaas.get(f'{self.endpoint}/{subscription_id}')
-
-        return self.response_data_to_subscription(response.json())
+        return self.asaas.cached(
+            self.endpoint,
+            subscription_id,
+            lambda: self.asaas.parse(
+                self.asaas.get(f'{self.endpoint}/{subscription_id}'),
+                self.response_data_to_subscription
+            )
+        )
 
     def create(
         self,
@@ -589,7 +1588,8 @@ class Subscriptions(ResponseDataToPayment):
         maxPayments: Optional[int] = None,
         externalReference: Optional[str] = None,
         split: Optional[List[payments.Split]] = None,
-        callback: Optional[payments.Callback] = None
+        callback: Optional[payments.Callback] = None,
+        idempotency_key: Optional[str] = None
     ) -> subscriptions.Subscription:
         """Create a new subscription"""
 
@@ -618,9 +1618,14 @@ class Subscriptions(ResponseDataToPayment):
             }
         )
 
-        response = self.asaas.post(f'{self.endpoint}', data)
+        response = self.asaas.post(
+            f'{self.endpoint}',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
 
-        return self.response_data_to_subscription(response.json())
+        return self.asaas.parse(response, self.response_data_to_subscription)
 
     def list(
         self,
@@ -656,7 +1661,47 @@ class Subscriptions(ResponseDataToPayment):
 
         response = self.asaas.get(self.endpoint, params)
 
-        return [self.response_data_to_subscription(subscription) for subscription in response.json()['data']]
+        return self.asaas.parse(response, self.response_data_to_subscription, many=True)
+
+    def iter_all(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[subscriptions.BillingType] = None,
+        status: Optional[subscriptions.Status] = None,
+        deletedOnly: Optional[bool] = None,
+        includeDeleted: Optional[bool] = None,
+        externalReference: Optional[str] = None,
+        order: Optional[subscriptions.Order] = None,
+        sort: Optional[subscriptions.Sort] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None
+    ) -> Iterator[subscriptions.Subscription]:
+        """Iterate over every subscription, fetching pages lazily"""
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'deletedOnly': deletedOnly,
+                'includeDeleted': includeDeleted,
+                'externalReference': externalReference,
+                'order': order.value if order else None,
+                'sort': sort.value if sort else None
+            }
+        )
+
+        return self.asaas.paginate(
+            self.endpoint,
+            params,
+            self.response_data_to_subscription,
+            page_size,
+            concurrency,
+            prefetch
+        )
 
     def update(
         self,
@@ -708,7 +1753,10 @@ class Subscriptions(ResponseDataToPayment):
             data
         )
 
-        return self.response_data_to_subscription(response.json())
+        result = self.asaas.parse(response, self.response_data_to_subscription)
+        self.asaas.cache_write(self.endpoint, subscription_id, result)
+
+        return result
 
     def delete(
         self,
@@ -717,6 +1765,7 @@ class Subscriptions(ResponseDataToPayment):
         """Delete a subscription by ID"""
 
         self.asaas.delete(f'subscriptions/{subscription_id}')
+        self.asaas.cache_write(self.endpoint, subscription_id)
 
     def list_payments(
         self,
@@ -734,4 +1783,4 @@ class Subscriptions(ResponseDataToPayment):
         response = self.asaas.get(
             f'{self.endpoint}/{subscription_id}/payments', params)
 
-        return self.response_data_to_payment(response.json()['data'])
+        return self.asaas.parse(response, self.response_data_to_payment, many=True)
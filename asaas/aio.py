@@ -0,0 +1,1156 @@
+from asaas import (
+    customer,
+    payments,
+    status,
+    subscriptions,
+    ResponseDataToCustomer,
+    ResponseDataToPayment,
+    ResponseDataToSubscription,
+    MAX_PAGE_SIZE
+)
+from asaas.utils import remove_none_and_empty_values
+from asaas.exceptions import (
+    AsaasError,
+    raise_for_status
+)
+from asaas.ratelimit import (
+    RateLimiter,
+    rate_limit_delay
+)
+from asaas.retry import Retry
+from asaas.metrics import (
+    Metrics,
+    endpoint_template
+)
+from asaas.json_backend import (
+    JSONBackend,
+    get_backend
+)
+from asaas.singleflight import AsyncSingleFlight
+from asaas.idempotency import (
+    IDEMPOTENCY_HEADER,
+    IdempotencyStore,
+    generate_idempotency_key
+)
+
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Optional,
+    List,
+    Union
+)
+
+from datetime import date
+
+from collections import deque
+from itertools import islice
+
+import asyncio
+import time
+import weakref
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncAsaas:
+    """Asyncio SDK for Asaas API"""
+
+    def __init__(
+        self,
+        api_key: str,
+        production: bool = False,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        timeout: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_retries: int = 3,
+        retry: Optional[Retry] = None,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        coalesce_gets: bool = False,
+        lazy_models: bool = False,
+        json_backend: Union[str, JSONBackend] = 'json',
+        metrics: Optional[Metrics] = None
+    ):
+        if httpx is None:
+            raise ImportError(
+                'AsyncAsaas requires httpx, install it with "pip install asaas-sdk-wlc[async]"'
+            )
+
+        self.base_url = 'https://www.asaas.com/api/v3' if production else 'https://sandbox.asaas.com/api/v3'
+        self.headers = {
+            'access_token': api_key
+        }
+
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.retry = retry
+        self.lazy_models = lazy_models
+        self.json_backend = get_backend(json_backend)
+        self.metrics = metrics
+        self.idempotency_store = idempotency_store if idempotency_store is not None else IdempotencyStore()
+        self.single_flight = AsyncSingleFlight() if coalesce_gets else None
+        self._idempotency_locks = weakref.WeakValueDictionary()
+
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+
+        self.customers = AsyncCostumers(self)
+        self.payments = AsyncPayments(self)
+        self.subscriptions = AsyncSubscriptions(self)
+
+    async def __aenter__(self) -> 'AsyncAsaas':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close every pooled connection"""
+
+        await self.client.aclose()
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
+        remember: bool = True
+    ) -> 'httpx.Response':
+        """Make a request to Asaas API
+
+        A request sent with an idempotency key is remembered in the idempotency
+        store, and replaying the same key returns the original response
+        instead of writing again. Keys generated by the SDK itself are sent
+        with remember=False, since nobody can replay them.
+        """
+
+        if idempotency_key is None or not remember:
+            return await self.send(method, endpoint, params, data, idempotency_key)
+
+        lock = self._idempotency_locks.setdefault(idempotency_key, asyncio.Lock())
+
+        async with lock:
+            stored = self.idempotency_store.get(idempotency_key)
+
+            if stored is not None:
+                return stored.to_httpx()
+
+            response = await self.send(method, endpoint, params, data, idempotency_key)
+            self.idempotency_store.set(idempotency_key, response)
+
+        return response
+
+    async def send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        idempotency_key: Optional[str] = None
+    ) -> 'httpx.Response':
+        """Make a request to Asaas API, honouring the rate limiter, HTTP 429 and the retry policy"""
+
+        headers = dict(self.headers)
+        body = None
+
+        if idempotency_key:
+            headers[IDEMPOTENCY_HEADER] = idempotency_key
+
+        if data is not None:
+            headers['Content-Type'] = 'application/json'
+            body = self.json_backend.dumps(data)
+
+        idempotent = idempotency_key is not None
+        attempt = 0
+        rate_limited = 0
+        metrics = self.metrics
+        template = endpoint_template(endpoint) if metrics is not None else None
+
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+
+            started = time.perf_counter()
+
+            try:
+                response = await self.client.request(
+                    method,
+                    f'{self.base_url}/{endpoint}/',
+                    headers=headers,
+                    params=params,
+                    content=body
+                )
+
+            except Exception as error:
+                delay = self.retry.delay_for_exception(
+                    method, attempt, error, idempotent) if self.retry else None
+
+                if metrics is not None:
+                    metrics.record_error(method, template, error)
+
+                if delay is None:
+                    raise
+
+                if metrics is not None:
+                    metrics.record_retry(method, template, type(error).__name__)
+
+                attempt += 1
+                await asyncio.sleep(delay)
+
+                continue
+
+            if metrics is not None:
+                metrics.record_request(method, template, response.status_code, time.perf_counter() - started)
+
+            if response.status_code == status.HTTP_429_TOO_MANY_REQUESTS and rate_limited < self.rate_limit_retries:
+                delay = rate_limit_delay(response, rate_limited)
+                rate_limited += 1
+
+                if metrics is not None:
+                    metrics.record_retry(method, template, str(response.status_code))
+
+                if self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+
+                continue
+
+            delay = self.retry.delay_for_status(
+                method, attempt, response, idempotent) if self.retry else None
+
+            if delay is None:
+                break
+
+            if metrics is not None:
+                metrics.record_retry(method, template, str(response.status_code))
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        try:
+            raise_for_status(response)
+
+        except AsaasError as error:
+            if metrics is not None:
+                metrics.record_error(method, template, error)
+
+            raise
+
+        return response
+
+    def decode(
+        self,
+        response: 'httpx.Response'
+    ) -> Any:
+        """Decode a JSON response body with the configured backend"""
+
+        if self.metrics is None:
+            return self.json_backend.loads(response.content)
+
+        started = time.perf_counter()
+        data = self.json_backend.loads(response.content)
+        self.metrics.record_parse('json', time.perf_counter() - started)
+
+        return data
+
+    async def fetch_page(
+        self,
+        endpoint: str,
+        params: dict,
+        offset: int,
+        limit: int
+    ) -> dict:
+        """Fetch a single page of a list endpoint"""
+
+        response = await self.get(
+            endpoint,
+            {**params, 'offset': offset, 'limit': limit}
+        )
+
+        return self.decode(response)
+
+    async def paginate(
+        self,
+        endpoint: str,
+        params: dict,
+        converter: Callable[[dict], object],
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None,
+        offset: int = 0
+    ) -> AsyncIterator:
+        """Iterate over every item of a list endpoint, one page at a time
+
+        With concurrency above one, the pages after the first are fetched by
+        up to that many concurrent tasks once totalCount is known, keeping up
+        to prefetch pages (twice the concurrency by default) in flight ahead
+        of the consumer. Items are always yielded in order. page_size is capped
+        at MAX_PAGE_SIZE, the most the API returns per page.
+        """
+
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        page = await self.fetch_page(endpoint, params, offset, page_size)
+
+        while True:
+            for item in page['data']:
+                yield converter(item)
+
+            if not page.get('hasMore') or not page['data']:
+                return
+
+            if concurrency > 1 and page.get('totalCount'):
+                break
+
+            offset += len(page['data'])
+            page = await self.fetch_page(endpoint, params, offset, page_size)
+
+        # The API caps limit, so later pages are planned with the size of the
+        # first full page rather than the size asked for
+        step = len(page['data'])
+        offsets = iter(range(offset + step, page['totalCount'], step))
+        window = max(prefetch or concurrency * 2, 1)
+        semaphore = asyncio.Semaphore(concurrency)
+        pending = deque()
+
+        async def fetch(next_offset: int) -> dict:
+            async with semaphore:
+                return await self.fetch_page(endpoint, params, next_offset, page_size)
+
+        try:
+            for next_offset in islice(offsets, window):
+                pending.append((next_offset, asyncio.ensure_future(fetch(next_offset))))
+
+            while pending:
+                offset, task = pending.popleft()
+                page = await task
+                # A short page before the end (items deleted while scanning)
+                # means the planned offsets would skip rows from here on
+                short = page.get('hasMore') and len(page['data']) < step
+
+                if not short:
+                    for next_offset in islice(offsets, 1):
+                        pending.append((next_offset, asyncio.ensure_future(fetch(next_offset))))
+
+                for item in page['data']:
+                    yield converter(item)
+
+                if short:
+                    break
+
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+        # Items created while scanning push totalCount past the planned offsets,
+        # and a short page stops the plan; either way the rest is read serially
+        if page.get('hasMore') and page['data']:
+            async for item in self.paginate(
+                endpoint,
+                params,
+                converter,
+                page_size,
+                offset=offset + len(page['data'])
+            ):
+                yield item
+
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None
+    ) -> 'httpx.Response':
+        """Make a GET request to Asaas API
+
+        With coalesce_gets, concurrent GETs for the same endpoint and params
+        share a single request and its response.
+        """
+
+        if self.single_flight is None:
+            return await self.request('GET', endpoint, params=params)
+
+        return await self.single_flight.do(
+            (endpoint, tuple(sorted((params or {}).items()))),
+            lambda: self.request('GET', endpoint, params=params)
+        )
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
+        remember: bool = True
+    ) -> 'httpx.Response':
+        """Make a POST request to Asaas API"""
+
+        return await self.request('POST', endpoint, data=data, idempotency_key=idempotency_key, remember=remember)
+
+    async def put(
+        self,
+        endpoint: str,
+        data: dict
+    ) -> 'httpx.Response':
+        """Make a PUT request to Asaas API"""
+
+        return await self.request('PUT', endpoint, data=data)
+
+    async def delete(
+        self,
+        endpoint: str
+    ) -> 'httpx.Response':
+        """Make a DELETE request to Asaas API"""
+
+        return await self.request('DELETE', endpoint)
+
+
+class AsyncCostumers(ResponseDataToCustomer):
+    """Class to manage asynchronously customers in Asaas API"""
+
+    def __init__(self, asaas: AsyncAsaas):
+        self.asaas = asaas
+        self.endpoint = 'customers'
+
+    async def retrieve(
+        self,
+        customer_id: str
+    ) -> customer.Customer:
+        """Retrieve a customer by ID"""
+
+        response = await self.asaas.get(f'{self.endpoint}/{customer_id}')
+
+        return self.response_data_to_customer(self.asaas.decode(response))
+
+    async def create(
+        self,
+        name: str,
+        cpfCnpj: str,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        mobilePhone: Optional[str] = None,
+        address: Optional[str] = None,
+        addressNumber: Optional[str] = None,
+        complement: Optional[str] = None,
+        province: Optional[str] = None,
+        postalCode: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        notificationDisabled: Optional[bool] = None,
+        additionalEmails: Optional[str] = None,
+        municipalInscription: Optional[str] = None,
+        stateInscription: Optional[str] = None,
+        observations: Optional[str] = None,
+        groupName: Optional[str] = None,
+        company: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ) -> customer.Customer:
+        """Create a new customer"""
+
+        data = remove_none_and_empty_values(
+            {
+                'name': name,
+                'cpfCnpj': cpfCnpj,
+                'email': email,
+                'phone': phone,
+                'mobilePhone': mobilePhone,
+                'address': address,
+                'addressNumber': addressNumber,
+                'complement': complement,
+                'province': province,
+                'postalCode': postalCode,
+                'externalReference': externalReference,
+                'notificationDisabled': notificationDisabled,
+                'additionalEmails': additionalEmails,
+                'municipalInscription': municipalInscription,
+                'stateInscription': stateInscription,
+                'observations': observations,
+                'groupName': groupName,
+                'company': company
+            }
+        )
+
+        response = await self.asaas.post(
+            f'{self.endpoint}',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
+
+        return self.response_data_to_customer(self.asaas.decode(response))
+
+    async def list(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        cpfCnpj: Optional[str] = None,
+        groupName: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[customer.Customer]:
+        """List customers"""
+
+        params = remove_none_and_empty_values(
+            {
+                'offset': offset,
+                'limit': limit,
+                'name': name,
+                'email': email,
+                'cpfCnpj': cpfCnpj,
+                'groupName': groupName,
+                'externalReference': externalReference
+            }
+        )
+
+        response = await self.asaas.get(self.endpoint, params)
+
+        return [self.response_data_to_customer(customer_dict) for customer_dict in self.asaas.decode(response)['data']]
+
+    def iter_all(
+        self,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        cpfCnpj: Optional[str] = None,
+        groupName: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None
+    ) -> AsyncIterator[customer.Customer]:
+        """Iterate over every customer, fetching pages lazily"""
+
+        params = remove_none_and_empty_values(
+            {
+                'name': name,
+                'email': email,
+                'cpfCnpj': cpfCnpj,
+                'groupName': groupName,
+                'externalReference': externalReference
+            }
+        )
+
+        return self.asaas.paginate(
+            self.endpoint,
+            params,
+            self.response_data_to_customer,
+            page_size,
+            concurrency,
+            prefetch
+        )
+
+    async def update(
+        self,
+        customer_id: str,
+        name: str,
+        cpfCnpj: str,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        mobilePhone: Optional[str] = None,
+        address: Optional[str] = None,
+        addressNumber: Optional[str] = None,
+        complement: Optional[str] = None,
+        province: Optional[str] = None,
+        postalCode: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        notificationDisabled: Optional[bool] = None,
+        additionalEmails: Optional[str] = None,
+        municipalInscription: Optional[str] = None,
+        stateInscription: Optional[str] = None,
+        observations: Optional[str] = None,
+        groupName: Optional[str] = None,
+        company: Optional[str] = None
+    ) -> customer.Customer:
+        """Update a customer by ID"""
+
+        data = remove_none_and_empty_values(
+            {
+                'name': name,
+                'cpfCnpj': cpfCnpj,
+                'email': email,
+                'phone': phone,
+                'mobilePhone': mobilePhone,
+                'address': address,
+                'addressNumber': addressNumber,
+                'complement': complement,
+                'province': province,
+                'postalCode': postalCode,
+                'externalReference': externalReference,
+                'notificationDisabled': notificationDisabled,
+                'additionalEmails': additionalEmails,
+                'municipalInscription': municipalInscription,
+                'stateInscription': stateInscription,
+                'observations': observations,
+                'groupName': groupName,
+                'company': company
+            }
+        )
+
+        response = await self.asaas.put(
+            f'{self.endpoint}/{customer_id}',
+            data
+        )
+
+        return self.response_data_to_customer(self.asaas.decode(response))
+
+    async def delete(
+        self,
+        customer_id: str
+    ) -> None:
+        """Delete a customer by ID"""
+
+        await self.asaas.delete(f'customers/{customer_id}')
+
+    async def restore(
+        self,
+        customer_id: str
+    ) -> customer.Customer:
+        """Restore a customer by ID"""
+
+        response = await self.asaas.post(f'{self.endpoint}/{customer_id}/restore')
+
+        return self.response_data_to_customer(self.asaas.decode(response))
+
+
+
+class AsyncPayments(ResponseDataToPayment):
+    """Class to manage asynchronously payments in Asaas API"""
+
+    def __init__(self, asaas: AsyncAsaas):
+        self.asaas = asaas
+        self.endpoint = 'payments'
+
+    async def retrieve(
+        self,
+        payment_id: str
+    ) -> payments.Payment:
+        """Retrieve a payment by ID"""
+
+        response = await self.asaas.get(f'{self.endpoint}/{payment_id}')
+
+        return self.response_data_to_payment(self.asaas.decode(response))
+
+    async def create(
+        self,
+        customer: str,
+        value: float,
+        dueDate: date,
+        billingType: payments.BillingType = payments.BillingType.UNDEFINED,
+        description: Optional[str] = None,
+        daysAfterDueDateToRegistrationCancellation: Optional[int] = None,
+        externalReference: Optional[str] = None,
+        installmentCount: Optional[int] = None,
+        totalValue: Optional[float] = None,
+        installmentValue: Optional[float] = None,
+        discount: Optional[payments.Discount] = None,
+        interest: Optional[payments.Interest] = None,
+        fine: Optional[payments.Fine] = None,
+        postalService: Optional[bool] = None,
+        split: Optional[List[payments.Split]] = None,
+        callback: Optional[payments.Callback] = None,
+        idempotency_key: Optional[str] = None
+    ) -> payments.Payment:
+        discount = discount.to_dict() if discount else None
+        interest = interest.to_dict() if interest else None
+        fine = fine.to_dict() if fine else None
+        split = [s.to_dict() for s in split] if split else None
+        callback = callback.to_dict() if callback else None
+
+        data = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'billingType': billingType.value,
+                'value': value,
+                'dueDate': dueDate.strftime('%Y-%m-%d'),
+                'description': description,
+                'daysAfterDueDateToRegistrationCancellation': daysAfterDueDateToRegistrationCancellation,
+                'externalReference': externalReference,
+                'installmentCount': installmentCount,
+                'totalValue': totalValue,
+                'installmentValue': installmentValue,
+                'discount': discount,
+                'interest': interest,
+                'fine': fine,
+                'postalService': postalService,
+                'split': split,
+                'callback': callback
+            }
+        )
+
+        response = await self.asaas.post(
+            f'{self.endpoint}',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
+
+        return self.response_data_to_payment(self.asaas.decode(response))
+
+    async def list(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[payments.BillingType] = None,
+        status: Optional[payments.Status] = None,
+        subscription: Optional[str] = None,
+        installment: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        paymentDate: Optional[date] = None,
+        invoiceStatus: Optional[str] = None,
+        estimatedCreditDate: Optional[date] = None,
+        pixQrCodeId: Optional[str] = None,
+        antipated: Optional[bool] = None,
+        dateCreatedGreaterThanOrEqual: Optional[date] = None,
+        dateCreatedLessThanOrEqual: Optional[date] = None,
+        paymentDateGreaterThanOrEqual: Optional[date] = None,
+        paymentDateLessThanOrEqual: Optional[date] = None,
+        estimatedCreditDateGreaterThanOrEqual: Optional[date] = None,
+        estimatedCreditDateLessThanOrEqual: Optional[date] = None,
+        dueDateGreaterThanOrEqual: Optional[date] = None,
+        dueDateLessThanOrEqual: Optional[date] = None,
+        user: Optional[str] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[payments.Payment]:
+        """List payments"""
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'subscription': subscription,
+                'installment': installment,
+                'externalReference': externalReference,
+                'paymentDate': paymentDate,
+                'invoiceStatus': invoiceStatus,
+                'estimatedCreditDate': estimatedCreditDate,
+                'pixQrCodeId': pixQrCodeId,
+                'antipated': antipated,
+                'dateCreatedGreaterThanOrEqual': dateCreatedGreaterThanOrEqual,
+                'dateCreatedLessThanOrEqual': dateCreatedLessThanOrEqual,
+                'paymentDateGreaterThanOrEqual': paymentDateGreaterThanOrEqual,
+                'paymentDateLessThanOrEqual': paymentDateLessThanOrEqual,
+                'estimatedCreditDateGreaterThanOrEqual': estimatedCreditDateGreaterThanOrEqual,
+                'estimatedCreditDateLessThanOrEqual': estimatedCreditDateLessThanOrEqual,
+                'dueDateGreaterThanOrEqual': dueDateGreaterThanOrEqual,
+                'dueDateLessThanOrEqual': dueDateLessThanOrEqual,
+                'user': user,
+                'offset': offset,
+                'limit': limit
+            }
+        )
+
+        response = await self.asaas.get(self.endpoint, params)
+
+        return [self.response_data_to_payment(payment) for payment in self.asaas.decode(response)['data']]
+
+    def iter_all(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[payments.BillingType] = None,
+        status: Optional[payments.Status] = None,
+        subscription: Optional[str] = None,
+        installment: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        paymentDate: Optional[date] = None,
+        invoiceStatus: Optional[str] = None,
+        estimatedCreditDate: Optional[date] = None,
+        pixQrCodeId: Optional[str] = None,
+        antipated: Optional[bool] = None,
+        dateCreatedGreaterThanOrEqual: Optional[date] = None,
+        dateCreatedLessThanOrEqual: Optional[date] = None,
+        paymentDateGreaterThanOrEqual: Optional[date] = None,
+        paymentDateLessThanOrEqual: Optional[date] = None,
+        estimatedCreditDateGreaterThanOrEqual: Optional[date] = None,
+        estimatedCreditDateLessThanOrEqual: Optional[date] = None,
+        dueDateGreaterThanOrEqual: Optional[date] = None,
+        dueDateLessThanOrEqual: Optional[date] = None,
+        user: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None
+    ) -> AsyncIterator[payments.Payment]:
+        """Iterate over every payment, fetching pages lazily"""
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'subscription': subscription,
+                'installment': installment,
+                'externalReference': externalReference,
+                'paymentDate': paymentDate,
+                'invoiceStatus': invoiceStatus,
+                'estimatedCreditDate': estimatedCreditDate,
+                'pixQrCodeId': pixQrCodeId,
+                'antipated': antipated,
+                'dateCreatedGreaterThanOrEqual': dateCreatedGreaterThanOrEqual,
+                'dateCreatedLessThanOrEqual': dateCreatedLessThanOrEqual,
+                'paymentDateGreaterThanOrEqual': paymentDateGreaterThanOrEqual,
+                'paymentDateLessThanOrEqual': paymentDateLessThanOrEqual,
+                'estimatedCreditDateGreaterThanOrEqual': estimatedCreditDateGreaterThanOrEqual,
+                'estimatedCreditDateLessThanOrEqual': estimatedCreditDateLessThanOrEqual,
+                'dueDateGreaterThanOrEqual': dueDateGreaterThanOrEqual,
+                'dueDateLessThanOrEqual': dueDateLessThanOrEqual,
+                'user': user
+            }
+        )
+
+        return self.asaas.paginate(
+            self.endpoint,
+            params,
+            self.response_data_to_payment,
+            page_size,
+            concurrency,
+            prefetch
+        )
+
+    async def update(
+        self,
+        payment_id: str,
+        value: Optional[float] = None,
+        dueDate: Optional[date] = None,
+        billingType: Optional[payments.BillingType] = None,
+        description: Optional[str] = None,
+        daysAfterDueDateToRegistrationCancellation: Optional[int] = None,
+        externalReference: Optional[str] = None,
+        installmentCount: Optional[int] = None,
+        totalValue: Optional[float] = None,
+        installmentValue: Optional[float] = None,
+        discount: Optional[payments.Discount] = None,
+        interest: Optional[payments.Interest] = None,
+        fine: Optional[payments.Fine] = None,
+        postalService: Optional[bool] = None,
+        split: Optional[List[payments.Split]] = None,
+        callback: Optional[payments.Callback] = None
+    ) -> payments.Payment:
+
+        discount = discount.to_dict() if discount else None
+        interest = interest.to_dict() if interest else None
+        fine = fine.to_dict() if fine else None
+        split = [s.to_dict() for s in split] if split else None
+        callback = callback.to_dict() if callback else None
+
+        data = remove_none_and_empty_values(
+            {
+                'billingType': billingType.value if billingType else None,
+                'value': value,
+                'dueDate': dueDate.strftime('%Y-%m-%d') if dueDate else None,
+                'description': description,
+                'daysAfterDueDateToRegistrationCancellation': daysAfterDueDateToRegistrationCancellation,
+                'externalReference': externalReference,
+                'installmentCount': installmentCount,
+                'totalValue': totalValue,
+                'installmentValue': installmentValue,
+                'discount': discount,
+                'interest': interest,
+                'fine': fine,
+                'postalService': postalService,
+                'split': split,
+                'callback': callback
+            }
+        )
+
+        response = await self.asaas.put(
+            f'{self.endpoint}/{payment_id}',
+            data
+        )
+
+        return self.response_data_to_payment(self.asaas.decode(response))
+
+    async def delete(
+        self,
+        payment_id: str
+    ) -> None:
+        """Delete a payment by ID"""
+
+        await self.asaas.delete(f'payments/{payment_id}')
+
+    async def restore(
+        self,
+        payment_id: str
+    ) -> payments.Payment:
+        """Restore a payment by ID"""
+
+        response = await self.asaas.post(f'{self.endpoint}/{payment_id}/restore')
+
+        return self.response_data_to_payment(self.asaas.decode(response))
+
+    async def retrieve_status(
+        self,
+        payment_id: str
+    ) -> payments.Status:
+        """Retrieve a payment status by ID"""
+
+        response = await self.asaas.get(f'{self.endpoint}/{payment_id}/status')
+
+        return self.asaas.decode(response)['status']
+
+    async def refund(
+        self,
+        payment_id: str,
+        value: Optional[float] = None,
+        description: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ) -> payments.Payment:
+        """payments.Refund a payment by ID"""
+
+        data = remove_none_and_empty_values(
+            {
+                'value': value,
+                'description': description
+            }
+        )
+
+        response = await self.asaas.post(
+            f'{self.endpoint}/{payment_id}/refund',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
+
+        return self.response_data_to_payment(self.asaas.decode(response))
+
+
+
+class AsyncSubscriptions(ResponseDataToSubscription):
+    """Class to manage asynchronously subscriptions in Asaas API"""
+
+    def __init__(self, asaas: AsyncAsaas):
+        self.asaas = asaas
+        self.endpoint = 'subscriptions'
+
+    async def retrieve(
+        self,
+        subscription_id: str
+    ) -> subscriptions.Subscription:
+        """Retrieve a subscription by ID"""
+
+        response = await self.asaas.get(f'{self.endpoint}/{subscription_id}')
+
+        return self.response_data_to_subscription(self.asaas.decode(response))
+
+    async def create(
+        self,
+        customer: str,
+        billingType: subscriptions.BillingType,
+        value: float,
+        nextDueDate: date,
+        cycle: subscriptions.Cycle,
+        discount: Optional[payments.Discount] = None,
+        interest: Optional[payments.Interest] = None,
+        fine: Optional[payments.Fine] = None,
+        description: Optional[str] = None,
+        endDate: Optional[date] = None,
+        maxPayments: Optional[int] = None,
+        externalReference: Optional[str] = None,
+        split: Optional[List[payments.Split]] = None,
+        callback: Optional[payments.Callback] = None,
+        idempotency_key: Optional[str] = None
+    ) -> subscriptions.Subscription:
+        """Create a new subscription"""
+
+        discount = discount.to_dict() if discount else None
+        interest = interest.to_dict() if interest else None
+        fine = fine.to_dict() if fine else None
+        split = [s.to_dict() for s in split] if split else None
+        callback = callback.to_dict() if callback else None
+
+        data = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'billingType': billingType.value,
+                'value': value,
+                'nextDueDate': nextDueDate.strftime('%Y-%m-%d'),
+                'cycle': cycle,
+                'discount': discount,
+                'interest': interest,
+                'fine': fine,
+                'description': description,
+                'endDate': endDate.strftime('%Y-%m-%d') if endDate else None,
+                'maxPayments': maxPayments,
+                'externalReference': externalReference,
+                'split': split,
+                'callback': callback
+            }
+        )
+
+        response = await self.asaas.post(
+            f'{self.endpoint}',
+            data,
+            idempotency_key=idempotency_key or generate_idempotency_key(),
+            remember=idempotency_key is not None
+        )
+
+        return self.response_data_to_subscription(self.asaas.decode(response))
+
+    async def list(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[subscriptions.BillingType] = None,
+        status: Optional[subscriptions.Status] = None,
+        deletedOnly: Optional[bool] = None,
+        includeDeleted: Optional[bool] = None,
+        externalReference: Optional[str] = None,
+        order: Optional[subscriptions.Order] = None,
+        sort: Optional[subscriptions.Sort] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[subscriptions.Subscription]:
+        """List subscriptions"""
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'deletedOnly': deletedOnly,
+                'includeDeleted': includeDeleted,
+                'externalReference': externalReference,
+                'order': order.value if order else None,
+                'sort': sort.value if sort else None,
+                'offset': offset,
+                'limit': limit
+            }
+        )
+
+        response = await self.asaas.get(self.endpoint, params)
+
+        return [self.response_data_to_subscription(subscription) for subscription in self.asaas.decode(response)['data']]
+
+    def iter_all(
+        self,
+        customer: Optional[str] = None,
+        customerGroupName: Optional[str] = None,
+        billingType: Optional[subscriptions.BillingType] = None,
+        status: Optional[subscriptions.Status] = None,
+        deletedOnly: Optional[bool] = None,
+        includeDeleted: Optional[bool] = None,
+        externalReference: Optional[str] = None,
+        order: Optional[subscriptions.Order] = None,
+        sort: Optional[subscriptions.Sort] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        prefetch: Optional[int] = None
+    ) -> AsyncIterator[subscriptions.Subscription]:
+        """Iterate over every subscription, fetching pages lazily"""
+
+        params = remove_none_and_empty_values(
+            {
+                'customer': customer,
+                'customerGroupName': customerGroupName,
+                'billingType': billingType.value if billingType else None,
+                'status': status.value if status else None,
+                'deletedOnly': deletedOnly,
+                'includeDeleted': includeDeleted,
+                'externalReference': externalReference,
+                'order': order.value if order else None,
+                'sort': sort.value if sort else None
+            }
+        )
+
+        return self.asaas.paginate(
+            self.endpoint,
+            params,
+            self.response_data_to_subscription,
+            page_size,
+            concurrency,
+            prefetch
+        )
+
+    async def update(
+        self,
+        subscription_id: str,
+        billingType: Optional[subscriptions.BillingType] = None,
+        value: Optional[float] = None,
+        status: Optional[subscriptions.Status] = None,
+        nextDueDate: Optional[date] = None,
+        discount: Optional[payments.Discount] = None,
+        interest: Optional[payments.Interest] = None,
+        fine: Optional[payments.Fine] = None,
+        cycle: Optional[subscriptions.Cycle] = None,
+        description: Optional[str] = None,
+        endDate: Optional[date] = None,
+        updatePendingPayments: Optional[bool] = None,
+        externalReference: Optional[str] = None,
+        split: Optional[List[payments.Split]] = None,
+        callback: Optional[payments.Callback] = None
+    ) -> subscriptions.Subscription:
+        """Update a subscription by ID"""
+
+        discount = discount.to_dict() if discount else None
+        interest = interest.to_dict() if interest else None
+        fine = fine.to_dict() if fine else None
+        split = [s.to_dict() for s in split] if split else None
+        callback = callback.to_dict() if callback else None
+
+        data = remove_none_and_empty_values(
+            {
+                'billingType': billingType.value if billingType else None,
+                'value': value,
+                'status': status.value if status else None,
+                'nextDueDate': nextDueDate.strftime('%Y-%m-%d') if nextDueDate else None,
+                'discount': discount,
+                'interest': interest,
+                'fine': fine,
+                'cycle': cycle,
+                'description': description,
+                'endDate': endDate.strftime('%Y-%m-%d') if endDate else None,
+                'updatePendingPayments': updatePendingPayments,
+                'externalReference': externalReference,
+                'split': split,
+                'callback': callback
+            }
+        )
+
+        response = await self.asaas.put(
+            f'{self.endpoint}/{subscription_id}',
+            data
+        )
+
+        return self.response_data_to_subscription(self.asaas.decode(response))
+
+    async def delete(
+        self,
+        subscription_id: str
+    ) -> None:
+        """Delete a subscription by ID"""
+
+        await self.asaas.delete(f'subscriptions/{subscription_id}')
+
+    async def list_payments(
+        self,
+        subscription_id: str,
+        status: Optional[payments.Status] = None,
+    ) -> List[payments.Payment]:
+        """List payments of a subscription"""
+
+        params = remove_none_and_empty_values(
+            {
+                'status': status.value if status else None,
+            }
+        )
+
+        response = await self.asaas.get(
+            f'{self.endpoint}/{subscription_id}/payments', params)
+
+        return [self.response_data_to_payment(payment) for payment in self.asaas.decode(response)['data']]
+
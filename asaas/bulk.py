@@ -0,0 +1,98 @@
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional
+)
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+
+class BulkResult:
+    """Outcome of one item of a bulk operation"""
+
+    def __init__(
+        self,
+        index: int,
+        item: Any,
+        result: Any = None,
+        error: Optional[Exception] = None
+    ) -> None:
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = f'error={self.error!r}' if self.error is not None else f'result={self.result!r}'
+
+        return f'BulkResult(index={self.index}, {outcome})'
+
+
+def run_bulk(
+    function: Callable[[Any], Any],
+    items: Iterable[Any],
+    concurrency: int = 4,
+    fail_fast: bool = False,
+    progress: Optional[Callable[[int, BulkResult], None]] = None
+) -> Iterator[BulkResult]:
+    """Call function for every item on a bounded thread pool
+
+    Items are consumed lazily, at most twice the concurrency ahead of the
+    results, and results are yielded in input order. Errors are returned as
+    failed results; with fail_fast, nothing else is submitted after the first
+    one and queued items are cancelled, but items already running still
+    complete and their results are yielded, so no side effect goes
+    unreported. progress, if given, is called with the number of completed
+    items and each result.
+    """
+
+    items = enumerate(items)
+    pending = deque()
+    completed = 0
+    stopped = False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        def submit(count: int) -> None:
+            for index, item in islice(items, count):
+                pending.append((index, item, executor.submit(function, item)))
+
+        try:
+            submit(max(concurrency, 1) * 2)
+
+            while pending:
+                index, item, future = pending.popleft()
+
+                try:
+                    result = BulkResult(index, item, result=future.result())
+
+                except Exception as error:
+                    result = BulkResult(index, item, error=error)
+
+                completed += 1
+
+                if progress is not None:
+                    progress(completed, result)
+
+                if fail_fast and not result.ok and not stopped:
+                    stopped = True
+
+                    for entry in list(pending):
+                        if entry[2].cancel():
+                            pending.remove(entry)
+
+                yield result
+
+                if not stopped:
+                    submit(1)
+
+        finally:
+            for _, _, future in pending:
+                future.cancel()
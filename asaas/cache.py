@@ -0,0 +1,193 @@
+from asaas.exceptions import NotFoundAsaas
+
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Optional
+)
+
+from collections import (
+    Counter,
+    OrderedDict
+)
+
+import threading
+import time
+
+
+class ResourceCache:
+    """Bounded in-memory LRU cache of retrieved models
+
+    Entries live for the resource's TTL (from ttls, falling back to ttl) and
+    the least recently used are evicted beyond max_size. When
+    cache_not_found is set, NotFoundAsaas errors are remembered for
+    not_found_ttl seconds too. Cached models are shared between callers.
+
+    A load that was in flight while the key was written (set, invalidate or
+    clear) returns its result without caching it, so a GET that started
+    before an update cannot replace the fresh model with the old one.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        ttls: Optional[dict] = None,
+        cache_not_found: bool = False,
+        not_found_ttl: Optional[float] = None
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.cache_not_found = cache_not_found
+        self.not_found_ttl = not_found_ttl if not_found_ttl is not None else ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        # Keys being loaded, and the write generation each was last written
+        # at while loading; both only hold keys with loads in flight
+        self._generation = 0
+        self._loading = Counter()
+        self._written = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(
+        self,
+        resource: str,
+        key: Hashable,
+        load: Callable[[], Any]
+    ) -> Any:
+        """Return the cached model, calling load() and caching its result on a miss"""
+
+        with self._lock:
+            entry = self._entries.get((resource, key))
+
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[(resource, key)]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                self._loading[(resource, key)] += 1
+                started = self._generation
+            else:
+                self.hits += 1
+                self._entries.move_to_end((resource, key))
+
+        if entry is not None:
+            if isinstance(entry[1], NotFoundAsaas):
+                raise NotFoundAsaas(*entry[1].args)
+
+            return entry[1]
+
+        try:
+            value = load()
+
+        except NotFoundAsaas as error:
+            self._finish_load(resource, key, started, error, self.not_found_ttl if self.cache_not_found else None)
+
+            raise
+
+        except BaseException:
+            self._finish_load(resource, key, started)
+
+            raise
+
+        self._finish_load(resource, key, started, value, self.ttls.get(resource, self.ttl))
+
+        return value
+
+    def _finish_load(
+        self,
+        resource: str,
+        key: Hashable,
+        started: int,
+        value: Any = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        """Cache a loaded value unless the key was written since the load started"""
+
+        with self._lock:
+            if ttl is not None and self._written.get((resource, key), -1) <= started:
+                self._put(resource, key, value, ttl)
+
+            self._loading[(resource, key)] -= 1
+
+            if not self._loading[(resource, key)]:
+                del self._loading[(resource, key)]
+                self._written.pop((resource, key), None)
+
+    def _bump(
+        self,
+        resource: str,
+        key: Hashable
+    ) -> None:
+        """Record a write, so loads of the key already in flight are not cached"""
+
+        self._generation += 1
+
+        if (resource, key) in self._loading:
+            self._written[(resource, key)] = self._generation
+
+    def set(
+        self,
+        resource: str,
+        key: Hashable,
+        value: Any
+    ) -> None:
+        """Cache a model, e.g. the fresh copy returned by a write"""
+
+        with self._lock:
+            self._bump(resource, key)
+            self._put(resource, key, value, self.ttls.get(resource, self.ttl))
+
+    def invalidate(
+        self,
+        resource: str,
+        key: Hashable
+    ) -> None:
+        """Drop a cached model"""
+
+        with self._lock:
+            self._bump(resource, key)
+            self._entries.pop((resource, key), None)
+
+    def clear(self) -> None:
+        """Drop every cached model"""
+
+        with self._lock:
+            self._generation += 1
+
+            for loading in self._loading:
+                self._written[loading] = self._generation
+
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counters"""
+
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _put(
+        self,
+        resource: str,
+        key: Hashable,
+        value: Any,
+        ttl: float
+    ) -> None:
+        """Store an entry; the lock must be held"""
+
+        self._entries[(resource, key)] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end((resource, key))
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
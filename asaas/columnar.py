@@ -0,0 +1,251 @@
+from asaas import payments
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union
+)
+
+from itertools import islice
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STATUS_CATEGORIES = tuple(payments.Status)
+BILLING_TYPE_CATEGORIES = tuple(payments.BillingType)
+
+MONEY_COLUMNS = ('value', 'netValue', 'interestValue')
+DATE_COLUMNS = ('dueDate', 'paymentDate', 'dateCreated')
+CATEGORY_COLUMNS = {
+    'status': STATUS_CATEGORIES,
+    'billingType': BILLING_TYPE_CATEGORIES
+}
+TEXT_COLUMNS = ('id', 'customer', 'subscription', 'externalReference')
+COLUMNS = TEXT_COLUMNS + MONEY_COLUMNS + DATE_COLUMNS + tuple(CATEGORY_COLUMNS)
+
+
+def _require_numpy() -> None:
+    if numpy is None:
+        raise ImportError(
+            'PaymentBatch requires numpy, install it with "pip install asaas-sdk-wlc[columnar]"'
+        )
+
+
+def _getter(item: Any) -> Any:
+    return lambda name: getattr(item, name, None)
+
+
+class PaymentBatch:
+    """Payments stored as one numpy array per field instead of one object per row
+
+    value, netValue and interestValue are int64 cents (0 when missing),
+    dueDate, paymentDate and dateCreated are datetime64[D] (NaT when
+    missing), and status and billingType are int8 codes into
+    STATUS_CATEGORIES and BILLING_TYPE_CATEGORIES (-1 when missing or
+    unknown). id, customer, subscription and externalReference are object
+    arrays.
+    """
+
+    __slots__ = (
+        'columns',
+    )
+
+    def __init__(
+        self,
+        columns: Dict[str, Any]
+    ) -> None:
+        _require_numpy()
+
+        self.columns = columns
+
+    @classmethod
+    def from_items(
+        cls,
+        items: Iterable[Union[dict, payments.Payment]]
+    ) -> 'PaymentBatch':
+        """Build a batch from raw payment dicts or Payment models
+
+        Items are consumed one at a time, so a lazy iterator such as
+        Payments.iter_all never holds more than a page of rows.
+        """
+
+        _require_numpy()
+
+        values = {name: [] for name in COLUMNS}
+        codes = {
+            name: {category: code for code, category in enumerate(categories)}
+            for name, categories in CATEGORY_COLUMNS.items()
+        }
+
+        plain = [
+            (name, values[name].append)
+            for name in TEXT_COLUMNS + MONEY_COLUMNS + DATE_COLUMNS
+        ]
+        coded = [
+            (name, mapping.get, values[name].append)
+            for name, mapping in codes.items()
+        ]
+
+        for item in items:
+            get = item.get if isinstance(item, dict) else _getter(item)
+
+            for name, append in plain:
+                append(get(name))
+
+            for name, lookup, append in coded:
+                append(lookup(get(name), -1))
+
+        columns = {}
+
+        for name in TEXT_COLUMNS:
+            columns[name] = numpy.array(values[name], dtype=object)
+
+        for name in MONEY_COLUMNS:
+            money = numpy.array(values[name], dtype=numpy.float64)
+            columns[name] = numpy.rint(numpy.nan_to_num(money) * 100).astype(numpy.int64)
+
+        for name in DATE_COLUMNS:
+            columns[name] = numpy.array(
+                [value if value is None else str(value)[:10] for value in values[name]],
+                dtype='datetime64[D]'
+            )
+
+        for name in CATEGORY_COLUMNS:
+            columns[name] = numpy.array(values[name], dtype=numpy.int8)
+
+        return cls(columns)
+
+    @classmethod
+    def concat(
+        cls,
+        batches: Sequence['PaymentBatch']
+    ) -> 'PaymentBatch':
+        """Join batches end to end"""
+
+        _require_numpy()
+
+        if not batches:
+            return cls.from_items(())
+
+        return cls({
+            name: numpy.concatenate([batch.columns[name] for batch in batches])
+            for name in COLUMNS
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+    def code(
+        self,
+        column: str,
+        category: str
+    ) -> int:
+        """Code of a status or billingType value, for comparisons against the column"""
+
+        return CATEGORY_COLUMNS[column].index(category)
+
+    def filter(
+        self,
+        mask: Any
+    ) -> 'PaymentBatch':
+        """Rows where the boolean mask (or index array) selects them"""
+
+        return PaymentBatch({name: column[mask] for name, column in self.columns.items()})
+
+    def where(
+        self,
+        status: Optional[payments.Status] = None,
+        billingType: Optional[payments.BillingType] = None
+    ) -> 'PaymentBatch':
+        """Rows matching the given status and billing type"""
+
+        mask = numpy.ones(len(self), dtype=bool)
+
+        if status is not None:
+            mask &= self.columns['status'] == self.code('status', status)
+
+        if billingType is not None:
+            mask &= self.columns['billingType'] == self.code('billingType', billingType)
+
+        return self.filter(mask)
+
+    def sum_by(
+        self,
+        by: str,
+        column: str = 'value'
+    ) -> Dict[str, int]:
+        """Total of a money column, in cents, for each status or billingType"""
+
+        categories = CATEGORY_COLUMNS[by]
+        codes = self.columns[by]
+        known = codes >= 0
+        totals = numpy.bincount(
+            codes[known],
+            weights=self.columns[column][known],
+            minlength=len(categories)
+        )
+
+        return {
+            category: int(total)
+            for category, total in zip(categories, totals)
+            if total
+        }
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Columns as a dict of numpy arrays, with the category codes decoded"""
+
+        columns = dict(self.columns)
+
+        for name, categories in CATEGORY_COLUMNS.items():
+            labels = numpy.array(categories + (None,), dtype=object)
+            columns[name] = labels[self.columns[name]]
+
+        return columns
+
+    def to_pandas(self) -> Any:
+        """DataFrame with categorical status and billingType and money in cents"""
+
+        import pandas
+
+        columns = dict(self.columns)
+
+        for name, categories in CATEGORY_COLUMNS.items():
+            columns[name] = pandas.Categorical.from_codes(
+                self.columns[name], categories=[str(category) for category in categories]
+            )
+
+        return pandas.DataFrame(columns)
+
+
+def to_columns(
+    items: Iterable[Union[dict, payments.Payment]]
+) -> Dict[str, Any]:
+    """Raw payment dicts or Payment models as a dict of numpy arrays"""
+
+    return PaymentBatch.from_items(items).to_columns()
+
+
+def iter_batches(
+    items: Iterable[Union[dict, payments.Payment]],
+    size: int = 10000
+) -> Iterator[PaymentBatch]:
+    """Split an iterator of payments into batches of at most size rows"""
+
+    items = iter(items)
+
+    while True:
+        batch = PaymentBatch.from_items(islice(items, size))
+
+        if not len(batch):
+            return
+
+        yield batch
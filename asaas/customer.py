@@ -3,6 +3,27 @@ from datetime import date
 
 
 class Customer:
+    __slots__ = (
+        'id',
+        'dateCreated',
+        'name',
+        'cpfCnpj',
+        'email',
+        'phone',
+        'mobilePhone',
+        'address',
+        'addressNumber',
+        'complement',
+        'province',
+        'postalCode',
+        'externalReference',
+        'notificationDisabled',
+        'additionalEmails',
+        'municipalInscription',
+        'stateInscription',
+        'observations'
+    )
+
     def __init__(
         self,
         id: str,
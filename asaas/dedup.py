@@ -0,0 +1,258 @@
+from collections import OrderedDict
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+
+
+def dedup_key(data: dict) -> str:
+    """Key of a webhook notification: its event id, or payment id, event and dateCreated"""
+
+    if data.get('id'):
+        return data['id']
+
+    payment = data.get('payment') or {}
+
+    return f'{payment.get("id")}:{data.get("event")}:{data.get("dateCreated")}'
+
+
+class MemoryDedupStore:
+    """Keys seen in the last ttl seconds, keeping at most max_size of them
+
+    The least recently seen keys are evicted first, so a redelivery arriving
+    after max_size newer events is treated as new.
+    """
+
+    # Whether discard() forgets a key; add() is atomic when it does
+    forgets = True
+
+    def __init__(
+        self,
+        max_size: int = 100000,
+        ttl: float = 24 * 60 * 60
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contains(
+        self,
+        key: str
+    ) -> bool:
+        """Whether a key was seen and has not expired"""
+
+        with self._lock:
+            expires_at = self._entries.get(key)
+
+            return expires_at is not None and expires_at >= time.monotonic()
+
+    def add(
+        self,
+        key: str
+    ) -> bool:
+        """Record a key, returning False if it was already seen"""
+
+        now = time.monotonic()
+
+        with self._lock:
+            expires_at = self._entries.get(key)
+
+            if expires_at is not None and expires_at >= now:
+                self._entries.move_to_end(key)
+
+                return False
+
+            self._entries[key] = now + self.ttl
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+            return True
+
+    def discard(
+        self,
+        key: str
+    ) -> None:
+        """Forget a key, so its next delivery is processed"""
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BloomDedupStore:
+    """Two rotating Bloom filters, for volumes too high to keep every key
+
+    Each filter holds capacity keys at the given false positive rate; when
+    the current one is full it replaces the previous one, so a key is
+    remembered for at least capacity further events. Memory is fixed at two
+    filters. A false positive drops a new event, with probability up to
+    twice error_rate, and keys cannot be discarded.
+    """
+
+    # Whether discard() forgets a key; add() is atomic when it does
+    forgets = False
+
+    def __init__(
+        self,
+        capacity: int = 1000000,
+        error_rate: float = 0.001
+    ) -> None:
+        self.capacity = capacity
+        self.bits = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.bits / capacity * math.log(2)), 1)
+        self._current = bytearray((self.bits + 7) // 8)
+        self._previous = bytearray((self.bits + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(
+        self,
+        key: str
+    ) -> list:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+
+        return [(first + index * second) % self.bits for index in range(self.hashes)]
+
+    @staticmethod
+    def _contains(
+        bits: bytearray,
+        positions: list
+    ) -> bool:
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def contains(
+        self,
+        key: str
+    ) -> bool:
+        """Whether a key was (probably) seen"""
+
+        positions = self._positions(key)
+
+        with self._lock:
+            return self._contains(self._current, positions) or self._contains(self._previous, positions)
+
+    def add(
+        self,
+        key: str
+    ) -> bool:
+        """Record a key, returning False if it was (probably) already seen"""
+
+        positions = self._positions(key)
+
+        with self._lock:
+            if self._contains(self._current, positions) or self._contains(self._previous, positions):
+                return False
+
+            if self._count >= self.capacity:
+                self._previous = self._current
+                self._current = bytearray(len(self._previous))
+                self._count = 0
+
+            for position in positions:
+                self._current[position >> 3] |= 1 << (position & 7)
+
+            self._count += 1
+
+            return True
+
+    def discard(
+        self,
+        key: str
+    ) -> None:
+        """Bloom filters cannot forget keys, so this does nothing
+
+        Callers check contains before processing an event and add its key
+        only once the event is accepted (see forgets).
+        """
+
+
+class SQLiteDedupStore:
+    """Keys seen in the last ttl seconds, in a SQLite file shared by processes
+
+    Expired keys are purged every purge_every additions, which bounds the
+    file by the traffic of one ttl window.
+    """
+
+    # Whether discard() forgets a key; add() is atomic when it does
+    forgets = True
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 24 * 60 * 60,
+        purge_every: int = 1000,
+        timeout: float = 30
+    ) -> None:
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self.connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._additions = 0
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS webhook_events (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)'
+            )
+
+    def contains(
+        self,
+        key: str
+    ) -> bool:
+        """Whether a key was seen and has not expired"""
+
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT 1 FROM webhook_events WHERE key = ? AND expires_at >= ?',
+                (key, time.time())
+            ).fetchone()
+
+        return row is not None
+
+    def add(
+        self,
+        key: str
+    ) -> bool:
+        """Record a key, returning False if it was already seen"""
+
+        now = time.time()
+
+        with self._lock:
+            cursor = self.connection.execute(
+                'INSERT INTO webhook_events (key, expires_at) VALUES (?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET expires_at = excluded.expires_at '
+                'WHERE webhook_events.expires_at < ?',
+                (key, now + self.ttl, now)
+            )
+            self._additions += 1
+
+            if self._additions % self.purge_every == 0:
+                self.connection.execute('DELETE FROM webhook_events WHERE expires_at < ?', (now,))
+
+        return cursor.rowcount == 1
+
+    def discard(
+        self,
+        key: str
+    ) -> None:
+        """Forget a key, so its next delivery is processed"""
+
+        with self._lock:
+            self.connection.execute('DELETE FROM webhook_events WHERE key = ?', (key,))
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.connection.execute('SELECT COUNT(*) FROM webhook_events').fetchone()[0]
+
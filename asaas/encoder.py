@@ -1,9 +1,11 @@
+from asaas.json_backend import default
+
 from json import JSONEncoder
 
 
 class AsaasEncoder(JSONEncoder):
     def default(self, object):
         try:
-            return object.to_dict()
-        except AttributeError:
+            return default(object)
+        except TypeError:
             return super().default(object)
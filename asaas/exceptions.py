@@ -1,10 +1,11 @@
 from asaas import status
+from asaas.utils import parse_retry_after
 
-from requests import Response
-from requests.exceptions import HTTPError
+from typing import Optional
 
 
-def raise_for_status(response: Response):
+def raise_for_status(response):
+    """Raise the matching AsaasError for a requests or httpx response"""
 
     if response.status_code == status.HTTP_400_BAD_REQUEST:
         error = response.json().get('errors')[0]
@@ -27,11 +28,16 @@ def raise_for_status(response: Response):
     elif response.status_code == status.HTTP_404_NOT_FOUND:
         raise NotFoundAsaas(response.url)
 
-    try:
-        response.raise_for_status()
+    elif response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+        raise TooManyRequestsAsaas(
+            response.url,
+            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+        )
 
-    except HTTPError as error:
-        raise AsaasError(error)
+    elif response.status_code >= status.HTTP_400_BAD_REQUEST:
+        reason = getattr(response, 'reason', None) or getattr(response, 'reason_phrase', '')
+
+        raise AsaasError(f'{response.status_code} Error: {reason} for url: {response.url}')
 
 
 class AsaasError(Exception):
@@ -68,3 +74,13 @@ class InvalidNameAsaas(AsaasError):
 
 class NotFoundAsaas(AsaasError):
     pass
+
+
+class TooManyRequestsAsaas(AsaasError):
+    def __init__(
+        self,
+        *args,
+        retry_after: Optional[float] = None
+    ) -> None:
+        super().__init__(*args)
+        self.retry_after = retry_after
@@ -0,0 +1,240 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union
+)
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import (
+    HTTPConnection,
+    HTTPSConnection
+)
+from urllib3.connectionpool import (
+    HTTPConnectionPool,
+    HTTPSConnectionPool
+)
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger('asaas')
+
+HOOKS = (
+    'before_request',
+    'after_response',
+    'on_error',
+    'after_parse'
+)
+
+PHASES = (
+    'connect',
+    'tls',
+    'server',
+    'download',
+    'decode',
+    'convert'
+)
+
+# Connection setup happens on the thread sending the request, so the
+# connection classes below leave their timings here for send() to collect.
+connection_phases = threading.local()
+
+_claim_lock = threading.Lock()
+
+
+def reset_connection_phases() -> None:
+    connection_phases.connect = None
+    connection_phases.tls = None
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTP connection recording how long DNS resolution and TCP connect took"""
+
+    def _new_conn(self) -> Any:
+        started = time.perf_counter()
+
+        try:
+            return super()._new_conn()
+
+        finally:
+            connection_phases.connect = time.perf_counter() - started
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection recording DNS and TCP connect, and the TLS handshake apart"""
+
+    def _new_conn(self) -> Any:
+        started = time.perf_counter()
+
+        try:
+            return super()._new_conn()
+
+        finally:
+            connection_phases.connect = time.perf_counter() - started
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        connection_phases.tls = time.perf_counter() - started - (getattr(connection_phases, 'connect', None) or 0)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections report their setup phases"""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+
+class RequestTiming:
+    """Where the time of one API call went, in seconds
+
+    connect is DNS resolution plus TCP connect and tls the TLS handshake;
+    both are None when a pooled connection was reused. server is the wait
+    for the response headers, download reading the body (None when
+    streamed), decode the JSON parsing and convert building the models.
+    Phases belong to the last attempt; total spans every attempt.
+    """
+
+    __slots__ = (
+        'method',
+        'endpoint',
+        'url',
+        'attempts',
+        'status_code',
+        'error',
+        'started',
+        'total',
+        'slow_logged',
+        'claimed'
+    ) + PHASES
+
+    def __init__(
+        self,
+        method: str,
+        endpoint: str,
+        url: str
+    ) -> None:
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.attempts = 0
+        self.status_code = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.total = None
+        self.slow_logged = False
+        self.claimed = False
+
+        for phase in PHASES:
+            setattr(self, phase, None)
+
+    def claim(self) -> bool:
+        """Take the timing for parsing its response, False when already taken
+
+        Coalesced GETs and replayed idempotent writes hand one response to
+        several callers; only the first parse fills this timing.
+        """
+
+        with _claim_lock:
+            if self.claimed:
+                return False
+
+            self.claimed = True
+
+            return True
+
+    def stop(self) -> float:
+        """Update total with the time elapsed since the call started"""
+
+        self.total = time.perf_counter() - self.started
+
+        return self.total
+
+    def to_dict(self) -> dict:
+        return {
+            'method': self.method,
+            'endpoint': self.endpoint,
+            'attempts': self.attempts,
+            'status_code': self.status_code,
+            'error': type(self.error).__name__ if self.error is not None else None,
+            'total': self.total,
+            **{phase: getattr(self, phase) for phase in PHASES}
+        }
+
+    def __repr__(self) -> str:
+        phases = ' '.join(
+            f'{phase}={getattr(self, phase) * 1000:.1f}ms'
+            for phase in PHASES
+            if getattr(self, phase) is not None
+        )
+
+        return (
+            f'{self.method} {self.endpoint} {self.status_code} in {(self.total or 0) * 1000:.1f}ms '
+            f'after {self.attempts} attempt(s): {phases}'
+        )
+
+
+def default_hooks() -> Dict[str, List[Callable]]:
+    return {event: [] for event in HOOKS}
+
+
+def dispatch_hook(
+    hooks: Dict[str, List[Callable]],
+    event: str,
+    *args: Any
+) -> None:
+    """Call every hook registered for an event"""
+
+    for hook in hooks[event]:
+        hook(*args)
+
+
+def log_slow_call(
+    timing: RequestTiming,
+    threshold: Optional[float]
+) -> None:
+    """Log a call whose total passed threshold seconds, once, on the asaas logger
+
+    Calls are checked when the response arrives and again after parsing, so
+    a call is logged with the phases measured up to the point it became slow.
+    """
+
+    if threshold is None or timing.slow_logged or (timing.total or 0) < threshold:
+        return
+
+    timing.slow_logged = True
+    logger.warning('Slow Asaas call: %r', timing)
+
+
+def normalize_hooks(
+    hooks: Optional[Dict[str, Union[Callable, Iterable[Callable]]]]
+) -> Dict[str, List[Callable]]:
+    """Hooks given to the client as a callable or list of callables per event"""
+
+    normalized = default_hooks()
+
+    for event, callbacks in (hooks or {}).items():
+        if event not in normalized:
+            raise ValueError(f'Unknown hook {event!r}, expected one of {", ".join(HOOKS)}')
+
+        normalized[event].extend([callbacks] if callable(callbacks) else callbacks)
+
+    return normalized
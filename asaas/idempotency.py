@@ -0,0 +1,182 @@
+from typing import (
+    Any,
+    Iterator,
+    Optional
+)
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from requests.structures import CaseInsensitiveDict
+
+import requests
+import threading
+import time
+import uuid
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def generate_idempotency_key() -> str:
+    """Generate a random idempotency key"""
+
+    return uuid.uuid4().hex
+
+
+class StoredResponse:
+    """Status, headers and body of a response, all a replay needs"""
+
+    __slots__ = (
+        'status_code',
+        'headers',
+        'content',
+        'url'
+    )
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: dict,
+        content: bytes,
+        url: str
+    ) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @classmethod
+    def from_response(
+        cls,
+        response: Any
+    ) -> 'StoredResponse':
+        """Keep what a requests or httpx response needs to be rebuilt
+
+        The body is already decoded, so transfer headers are dropped.
+        """
+
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')
+        }
+
+        return cls(response.status_code, headers, response.content, str(response.url))
+
+    def to_requests(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = self.url
+        response.encoding = 'utf-8'
+        response._content = self.content
+        response._content_consumed = True
+
+        return response
+
+    def to_httpx(self) -> Any:
+        import httpx
+
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=httpx.Request('POST', self.url)
+        )
+
+
+class IdempotencyStore:
+    """Bounded in-memory store of responses to writes sent with an idempotency key
+
+    Only the status, headers and body of each response are kept (see
+    StoredResponse). Entries expire after ttl seconds and the least recently
+    used ones are evicted beyond max_size. lock() serializes callers
+    replaying the same key, so only the first of them reaches the API.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: float = 24 * 60 * 60
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: str
+    ) -> Optional[StoredResponse]:
+        """Return the response remembered for a key, if any"""
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            expires_at, response = entry
+
+            if expires_at < time.monotonic():
+                del self._entries[key]
+
+                return None
+
+            self._entries.move_to_end(key)
+
+            return response
+
+    def set(
+        self,
+        key: str,
+        response: Any
+    ) -> None:
+        """Remember the status, headers and body of the response to a key"""
+
+        stored = response if isinstance(response, StoredResponse) else StoredResponse.from_response(response)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, stored)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(
+        self,
+        key: str
+    ) -> None:
+        """Forget the response to a key"""
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    @contextmanager
+    def lock(
+        self,
+        key: str
+    ) -> Iterator[None]:
+        """Hold an exclusive lock for a key while its request is in flight"""
+
+        with self._lock:
+            key_lock, users = self._key_locks.get(key, (None, 0))
+            key_lock = key_lock or threading.Lock()
+            self._key_locks[key] = (key_lock, users + 1)
+
+        try:
+            with key_lock:
+                yield
+
+        finally:
+            with self._lock:
+                key_lock, users = self._key_locks[key]
+
+                if users == 1:
+                    del self._key_locks[key]
+                else:
+                    self._key_locks[key] = (key_lock, users - 1)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,282 @@
+from asaas.bulk import run_bulk
+
+from typing import (
+    Any,
+    IO,
+    Iterator,
+    Optional,
+    Tuple,
+    get_args
+)
+
+from collections import Counter
+
+import csv
+import inspect
+import json
+import os
+import re
+
+TRUE_VALUES = ('true', '1', 'yes', 'sim', 's')
+FALSE_VALUES = ('false', '0', 'no', 'nao', 'não', 'n')
+
+
+def normalize_cpf_cnpj(value: Optional[str]) -> str:
+    """Keep only the digits of a CPF or CNPJ"""
+
+    return re.sub(r'\D', '', value or '')
+
+
+def coerce(
+    value: Any,
+    annotation: Any
+) -> Any:
+    """Convert a CSV string to the bool, int or float a create() argument expects"""
+
+    if not isinstance(value, str):
+        return value
+
+    kinds = get_args(annotation) or (annotation,)
+
+    if bool in kinds:
+        lowered = value.strip().lower()
+
+        if lowered in TRUE_VALUES:
+            return True
+
+        if lowered in FALSE_VALUES:
+            return False
+
+        raise ValueError(f'Invalid boolean: {value!r}')
+
+    if int in kinds:
+        return int(value)
+
+    if float in kinds:
+        return float(value.replace(',', '.'))
+
+    return value
+
+
+def read_rows(
+    path: str,
+    format: Optional[str] = None
+) -> Iterator[dict]:
+    """Stream rows from a CSV or NDJSON file, inferring the format from the extension"""
+
+    format = format or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+    with open(path, newline='', encoding='utf-8') as file:
+        if format == 'csv':
+            yield from csv.DictReader(file)
+
+        elif format == 'ndjson':
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+        else:
+            raise ValueError(f'Unsupported format: {format}')
+
+
+class CustomerImporter:
+    """Stream customers from a CSV or NDJSON file into Asaas
+
+    cpfCnpj values are normalized and deduplicated against the rest of the
+    file and against the customers already in the account, which are indexed
+    up front with Costumers.iter_all. New customers are created and existing
+    ones updated (unless update_existing is off), concurrently.
+
+    CSV values are converted to the types of Costumers.create (e.g.
+    notificationDisabled 'false' becomes False).
+
+    One JSON line per row is appended to results_path. Every
+    checkpoint_every rows, the number of rows done, the rows that failed and
+    the size of the results file are saved together to checkpoint_path.
+    Running the same file again resumes after the last checkpoint, retries
+    the failed rows and truncates results written after it, so no row is
+    reported twice for one attempt; a retried row gets a new line, and the
+    last line of a row is its outcome.
+    """
+
+    def __init__(
+        self,
+        asaas,
+        concurrency: int = 4,
+        update_existing: bool = True,
+        checkpoint_path: Optional[str] = None,
+        results_path: Optional[str] = None,
+        checkpoint_every: int = 100
+    ) -> None:
+        self.asaas = asaas
+        self.concurrency = concurrency
+        self.update_existing = update_existing
+        self.checkpoint_path = checkpoint_path
+        self.results_path = results_path
+        self.checkpoint_every = checkpoint_every
+        self.fields = {
+            name: parameter.annotation
+            for name, parameter in inspect.signature(asaas.customers.create).parameters.items()
+            if name != 'idempotency_key'
+        }
+
+    def build_index(self) -> dict:
+        """Map the normalized cpfCnpj of every existing customer to its ID"""
+
+        return {
+            normalize_cpf_cnpj(customer.cpfCnpj): customer.id
+            for customer in self.asaas.customers.iter_all(concurrency=self.concurrency)
+        }
+
+    def run(
+        self,
+        path: str,
+        format: Optional[str] = None
+    ) -> dict:
+        """Import a file, returning how many rows ended in each action"""
+
+        index = self.build_index()
+        checkpoint = self.load_checkpoint()
+        resume_after = done = checkpoint['rows']
+        retry = set(checkpoint['failed'])
+        failed = set(retry)
+        seen = set()
+        summary = Counter()
+
+        def plan(rows: Iterator[dict]) -> Iterator[Tuple[int, str, str, dict]]:
+            for number, row in enumerate(rows, start=1):
+                cpf_cnpj = normalize_cpf_cnpj(row.get('cpfCnpj'))
+
+                if not cpf_cnpj:
+                    action = 'invalid'
+                elif cpf_cnpj in seen:
+                    action = 'duplicate'
+                elif cpf_cnpj in index:
+                    action = 'update' if self.update_existing else 'skipped'
+                else:
+                    action = 'create'
+
+                seen.add(cpf_cnpj)
+
+                if number <= resume_after and number not in retry:
+                    continue
+
+                try:
+                    data = {
+                        field: coerce(value, self.fields[field]) for field, value in row.items()
+                        if field in self.fields and value not in (None, '')
+                    }
+
+                except ValueError:
+                    action = 'invalid'
+                    data = {}
+
+                data['cpfCnpj'] = cpf_cnpj
+
+                yield number, action, cpf_cnpj, data
+
+        results = None
+
+        if self.results_path:
+            results = open(self.results_path, 'a', encoding='utf-8')
+
+            # Rows after the last checkpoint are processed again
+            if checkpoint['results_size'] is not None:
+                results.truncate(checkpoint['results_size'])
+
+        try:
+            for result in run_bulk(
+                lambda item: self.apply(*item[1:], index),
+                plan(read_rows(path, format)),
+                self.concurrency
+            ):
+                number, action, cpf_cnpj, _ = result.item
+                customer_id = result.result
+
+                if not result.ok:
+                    action = 'error'
+                    failed.add(number)
+                else:
+                    failed.discard(number)
+
+                    if action in ('create', 'update'):
+                        action += 'd'
+
+                summary[action] += 1
+
+                if results is not None:
+                    results.write(json.dumps({
+                        'row': number,
+                        'cpfCnpj': cpf_cnpj,
+                        'action': action,
+                        'id': customer_id,
+                        'error': str(result.error) if result.error else None
+                    }) + '\n')
+
+                done = max(done, number)
+
+                if number % self.checkpoint_every == 0:
+                    self.save_checkpoint(done, failed, results)
+
+        finally:
+            self.save_checkpoint(done, failed, results)
+
+            if results is not None:
+                results.close()
+
+        return dict(summary)
+
+    def apply(
+        self,
+        action: str,
+        cpf_cnpj: str,
+        data: dict,
+        index: dict
+    ) -> Optional[str]:
+        """Perform the planned action for a row, returning the customer ID"""
+
+        if action == 'create':
+            return self.asaas.customers.create(**data).id
+
+        if action == 'update':
+            return self.asaas.customers.update(index[cpf_cnpj], **data).id
+
+        return index.get(cpf_cnpj)
+
+    def load_checkpoint(self) -> dict:
+        """Rows completed by previous runs, those that failed and the results size then"""
+
+        checkpoint = {'rows': 0, 'failed': [], 'results_size': None}
+
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return checkpoint
+
+        with open(self.checkpoint_path, encoding='utf-8') as file:
+            checkpoint.update(json.load(file))
+
+        return checkpoint
+
+    def save_checkpoint(
+        self,
+        rows: int,
+        failed: set,
+        results: Optional[IO] = None
+    ) -> None:
+        """Atomically record the rows completed, the failed ones and the results size"""
+
+        if not self.checkpoint_path:
+            return
+
+        if results is not None:
+            results.flush()
+
+        temporary = f'{self.checkpoint_path}.tmp'
+
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump({
+                'rows': rows,
+                'failed': sorted(failed),
+                'results_size': results.tell() if results is not None else None
+            }, file)
+
+        os.replace(temporary, self.checkpoint_path)
@@ -0,0 +1,126 @@
+from typing import (
+    Any,
+    Optional,
+    Union
+)
+
+from datetime import (
+    date,
+    datetime
+)
+
+import json
+
+
+def default(object: Any) -> Any:
+    """Serialize models through to_dict() and dates as ISO 8601, for every backend"""
+
+    to_dict = getattr(object, 'to_dict', None)
+
+    if to_dict is not None:
+        return to_dict()
+
+    if isinstance(object, (date, datetime)):
+        return object.isoformat()
+
+    raise TypeError(f'Object of type {type(object).__name__} is not JSON serializable')
+
+
+class JSONBackend:
+    """Standard library json, always available"""
+
+    name = 'json'
+
+    def dumps(self, object: Any) -> bytes:
+        return json.dumps(object, default=default, separators=(',', ':')).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonBackend(JSONBackend):
+    """orjson, serializing dates natively"""
+
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, object: Any) -> bytes:
+        return self._orjson.dumps(object, default=default)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonBackend(JSONBackend):
+    """ujson"""
+
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._ujson = ujson
+
+    def dumps(self, object: Any) -> bytes:
+        return self._ujson.dumps(object, default=default, ensure_ascii=False).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._ujson.loads(data)
+
+
+BACKENDS = {
+    backend.name: backend for backend in (
+        JSONBackend,
+        OrjsonBackend,
+        UjsonBackend
+    )
+}
+
+
+def available_backends() -> list:
+    """Names of the backends whose library is installed"""
+
+    names = []
+
+    for name, backend in BACKENDS.items():
+        try:
+            backend()
+
+        except ImportError:
+            continue
+
+        names.append(name)
+
+    return names
+
+
+def get_backend(backend: Optional[Union[str, JSONBackend]] = None) -> JSONBackend:
+    """Resolve a backend name, 'auto' for the fastest installed one, or an instance"""
+
+    if isinstance(backend, JSONBackend):
+        return backend
+
+    if backend == 'auto':
+        for name in ('orjson', 'ujson'):
+            try:
+                return BACKENDS[name]()
+
+            except ImportError:
+                continue
+
+        return JSONBackend()
+
+    return BACKENDS[backend or 'json']()
+
+
+def dumps(
+    object: Any,
+    backend: Optional[Union[str, JSONBackend]] = None
+) -> bytes:
+    """Serialize models, dates and plain values to JSON bytes"""
+
+    return get_backend(backend).dumps(object)
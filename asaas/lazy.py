@@ -0,0 +1,105 @@
+from asaas import (
+    customer,
+    payments,
+    subscriptions
+)
+
+from typing import (
+    Any,
+    Callable
+)
+
+from datetime import date
+
+
+def parse_date(value: Any) -> date:
+    return value if type(value) == date else date.fromisoformat(value)
+
+
+def nested(model: type) -> Callable[[dict], Any]:
+    return lambda value: model(**value)
+
+
+def nested_list(model: type) -> Callable[[list], Any]:
+    return lambda values: [model(**value) for value in values]
+
+
+class LazyModel:
+    """Model view over a decoded JSON dict
+
+    Attributes are read from the dict on first access, converted (dates
+    parsed, nested objects built) and memoized in the model's slot, so rows
+    whose fields are never read cost almost nothing. The dict is never
+    modified.
+    """
+
+    __slots__ = ()
+
+    fields = frozenset()
+    converters = {}
+
+    def __init__(
+        self,
+        data: dict
+    ) -> None:
+        self._data = data
+
+    def __getattr__(
+        self,
+        name: str
+    ) -> Any:
+        # Only reached while the field's slot is still empty
+        if name not in self.fields:
+            raise AttributeError(
+                f'{self.__class__.__name__!r} object has no attribute {name!r}')
+
+        value = self._data.get(name)
+
+        if name in self.converters:
+            value = self.converters[name](value) if value else None
+
+        setattr(self, name, value)
+
+        return value
+
+
+class LazyCustomer(LazyModel, customer.Customer):
+    __slots__ = ('_data',)
+
+    fields = frozenset(customer.Customer.__slots__)
+    converters = {
+        'dateCreated': parse_date
+    }
+
+
+class LazyPayment(LazyModel, payments.Payment):
+    __slots__ = ('_data',)
+
+    fields = frozenset(payments.Payment.__slots__)
+    converters = {
+        'dateCreated': parse_date,
+        'dueDate': parse_date,
+        'originalDueDate': parse_date,
+        'paymentDate': parse_date,
+        'clientPaymentDate': parse_date,
+        'discount': nested(payments.Discount),
+        'interest': nested(payments.Interest),
+        'fine': nested(payments.Fine),
+        'split': nested_list(payments.Split),
+        'refunds': nested_list(payments.Refund)
+    }
+
+
+class LazySubscription(LazyModel, subscriptions.Subscription):
+    __slots__ = ('_data',)
+
+    fields = frozenset(subscriptions.Subscription.__slots__)
+    converters = {
+        'dateCreated': parse_date,
+        'nextDueDate': parse_date,
+        'endDate': parse_date,
+        'discount': nested(payments.Discount),
+        'interest': nested(payments.Interest),
+        'fine': nested(payments.Fine),
+        'split': nested_list(payments.Split)
+    }
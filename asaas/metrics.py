@@ -0,0 +1,292 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple
+)
+
+from bisect import bisect_left
+
+import functools
+import threading
+import time
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PARSE_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+
+DESCRIPTIONS = {
+    'asaas_requests_total': ('counter', 'Responses received from the Asaas API, by status code'),
+    'asaas_request_errors_total': ('counter', 'Failed requests, by exception class'),
+    'asaas_retries_total': ('counter', 'Repeated requests, by reason'),
+    'asaas_request_duration_seconds': ('histogram', 'Time from sending a request to receiving its response'),
+    'asaas_parse_duration_seconds': ('histogram', 'Time spent decoding JSON and building models')
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Endpoint with its ids replaced, e.g. payments/{id}/refund"""
+
+    return '/'.join(
+        '{id}' if index % 2 else segment
+        for index, segment in enumerate(endpoint.strip('/').split('/'))
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    """Observation counts per bucket upper bound, plus their sum"""
+
+    __slots__ = (
+        'buckets',
+        'counts',
+        'sum',
+        'count'
+    )
+
+    def __init__(
+        self,
+        buckets: Sequence[float]
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(
+        self,
+        value: float
+    ) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        return {
+            'buckets': dict(zip(self.buckets + (float('inf'),), self.counts)),
+            'sum': self.sum,
+            'count': self.count
+        }
+
+
+class Metrics:
+    """Counters and latency histograms of the requests made by a client
+
+    Requests are labelled by method and endpoint template (see
+    endpoint_template), so ids never become labels. Every observation is
+    also passed to the callbacks as callback(name, labels, value), for
+    exporting to other systems; to_prometheus renders the Prometheus text
+    format.
+    """
+
+    def __init__(
+        self,
+        request_buckets: Sequence[float] = REQUEST_BUCKETS,
+        parse_buckets: Sequence[float] = PARSE_BUCKETS,
+        callbacks: Iterable[Callable[[str, Dict[str, str], float], None]] = ()
+    ) -> None:
+        self.request_buckets = tuple(request_buckets)
+        self.parse_buckets = tuple(parse_buckets)
+        self.callbacks = list(callbacks)
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(
+        self,
+        callback: Callable[[str, Dict[str, str], float], None]
+    ) -> None:
+        """Call callback(name, labels, value) on every observation"""
+
+        self.callbacks.append(callback)
+
+    def _notify(
+        self,
+        name: str,
+        labels: Labels,
+        value: float
+    ) -> None:
+        for callback in self.callbacks:
+            callback(name, dict(labels), value)
+
+    def increment(
+        self,
+        name: str,
+        labels: Labels,
+        value: float = 1
+    ) -> None:
+        key = (name, labels)
+
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+        if self.callbacks:
+            self._notify(name, labels, value)
+
+    def observe(
+        self,
+        name: str,
+        labels: Labels,
+        value: float,
+        buckets: Sequence[float]
+    ) -> None:
+        key = (name, labels)
+
+        with self._lock:
+            histogram = self.histograms.get(key)
+
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+
+            histogram.observe(value)
+
+        if self.callbacks:
+            self._notify(name, labels, value)
+
+    def record_request(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration: float
+    ) -> None:
+        """Count a response and observe its latency"""
+
+        labels = (('method', method), ('endpoint', endpoint))
+
+        self.increment('asaas_requests_total', labels + (('status', str(status_code)),))
+        self.observe('asaas_request_duration_seconds', labels, duration, self.request_buckets)
+
+    def record_error(
+        self,
+        method: str,
+        endpoint: str,
+        error: BaseException
+    ) -> None:
+        """Count a failed request by the class of its exception"""
+
+        self.increment(
+            'asaas_request_errors_total',
+            (('method', method), ('endpoint', endpoint), ('error', type(error).__name__))
+        )
+
+    def record_retry(
+        self,
+        method: str,
+        endpoint: str,
+        reason: str
+    ) -> None:
+        """Count a repeated request, by status code or exception class"""
+
+        self.increment(
+            'asaas_retries_total',
+            (('method', method), ('endpoint', endpoint), ('reason', reason))
+        )
+
+    def record_parse(
+        self,
+        stage: str,
+        duration: float
+    ) -> None:
+        """Observe the time spent decoding JSON (stage json) or building a model"""
+
+        self.observe('asaas_parse_duration_seconds', (('stage', stage),), duration, self.parse_buckets)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Current values, as plain dicts keyed by metric name"""
+
+        with self._lock:
+            counters = list(self.counters.items())
+            histograms = [(key, histogram.to_dict()) for key, histogram in self.histograms.items()]
+
+        result = {}
+
+        for (name, labels), value in counters:
+            result.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+
+        for (name, labels), histogram in histograms:
+            result.setdefault(name, []).append({'labels': dict(labels), **histogram})
+
+        return result
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                ((key, histogram.buckets, list(histogram.counts), histogram.sum, histogram.count)
+                 for key, histogram in self.histograms.items()),
+                key=lambda item: item[0]
+            )
+
+        lines = []
+        described = set()
+
+        def describe(name: str) -> None:
+            if name not in described:
+                kind, description = DESCRIPTIONS.get(name, ('untyped', name))
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} {kind}')
+                described.add(name)
+
+        for (name, labels), value in counters:
+            describe(name)
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        for (name, labels), buckets, counts, total, count in histograms:
+            describe(name)
+            cumulative = 0
+
+            for bound, bucket_count in zip(buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+
+            lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def timed_conversion(stage: str) -> Callable:
+    """Record how long a response_data_to_* converter takes, when metrics are on"""
+
+    def decorate(convert: Callable[[Any, dict], Any]) -> Callable[[Any, dict], Any]:
+        @functools.wraps(convert)
+        def wrapper(self: Any, data: dict) -> Any:
+            metrics: Optional[Metrics] = getattr(self.asaas, 'metrics', None)
+
+            if metrics is None:
+                return convert(self, data)
+
+            started = time.perf_counter()
+
+            try:
+                return convert(self, data)
+
+            finally:
+                metrics.record_parse(stage, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,443 @@
+from asaas import (
+    customer,
+    payments,
+    subscriptions
+)
+
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional
+)
+
+from datetime import date
+from itertools import islice
+
+import sqlite3
+import threading
+
+RESOURCES = ('customers', 'payments', 'subscriptions')
+
+COLUMNS = {
+    'customers': ('cpfCnpj', 'email', 'externalReference', 'dateCreated', 'deleted'),
+    'payments': (
+        'customer',
+        'subscription',
+        'installment',
+        'externalReference',
+        'status',
+        'billingType',
+        'value',
+        'dueDate',
+        'paymentDate',
+        'dateCreated',
+        'deleted'
+    ),
+    'subscriptions': (
+        'customer',
+        'externalReference',
+        'status',
+        'billingType',
+        'value',
+        'nextDueDate',
+        'dateCreated',
+        'deleted'
+    )
+}
+
+INDEXES = {
+    'customers': ('cpfCnpj', 'externalReference'),
+    'payments': ('customer', 'subscription', 'externalReference', 'status', 'dueDate'),
+    'subscriptions': ('customer', 'externalReference', 'status')
+}
+
+RANGE_SUFFIXES = {
+    'GreaterThanOrEqual': '>=',
+    'LessThanOrEqual': '<='
+}
+
+WRITE_CHUNK = 500
+
+
+class Mirror:
+    """Local SQLite copy of customers, payments and subscriptions
+
+    backfill walks the list endpoints once; refresh then only fetches what
+    changed since the last sync. Payments are refreshed by the
+    dateCreated, paymentDate and dueDate filters (new, paid and newly
+    overdue payments). Customers and subscriptions have no date filters, so
+    they are walked newest first until one older than the last sync shows
+    up, which catches new records only; upsert keeps edits in sync, for
+    example from webhooks.
+
+    Queries are answered from the indexed tables and return the same model
+    classes as the API.
+    """
+
+    def __init__(
+        self,
+        asaas: Any,
+        path: str = ':memory:'
+    ) -> None:
+        self.asaas = asaas
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.converters = {
+            'customers': asaas.customers.response_data_to_customer,
+            'payments': asaas.payments.response_data_to_payment,
+            'subscriptions': asaas.subscriptions.response_data_to_subscription
+        }
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS sync_state (resource TEXT PRIMARY KEY, synced_at TEXT)'
+            )
+
+            for resource, columns in COLUMNS.items():
+                self.connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS {resource} '
+                    f'(id TEXT PRIMARY KEY, {", ".join(columns)}, data BLOB NOT NULL)'
+                )
+
+                for column in INDEXES[resource]:
+                    self.connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS {resource}_{column} ON {resource} ({column})'
+                    )
+
+    def __enter__(self) -> 'Mirror':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database"""
+
+        self.connection.close()
+
+    def upsert(
+        self,
+        resource: str,
+        items: Iterable[dict]
+    ) -> int:
+        """Insert or replace raw API objects, returning how many were written"""
+
+        columns = COLUMNS[resource]
+        statement = (
+            f'INSERT OR REPLACE INTO {resource} (id, {", ".join(columns)}, data) '
+            f'VALUES ({", ".join("?" * (len(columns) + 2))})'
+        )
+        dumps = self.asaas.json_backend.dumps
+        items = iter(items)
+        written = 0
+
+        while True:
+            rows = [
+                (item['id'], *(item.get(column) for column in columns), dumps(item))
+                for item in islice(items, WRITE_CHUNK)
+            ]
+
+            if not rows:
+                return written
+
+            with self.lock, self.connection:
+                self.connection.executemany(statement, rows)
+
+            written += len(rows)
+
+    def remove(
+        self,
+        resource: str,
+        id: str
+    ) -> None:
+        """Drop an object from the mirror"""
+
+        with self.lock, self.connection:
+            self.connection.execute(f'DELETE FROM {resource} WHERE id = ?', (id,))
+
+    def synced_at(
+        self,
+        resource: str
+    ) -> Optional[date]:
+        """Date of the last backfill or refresh of a resource"""
+
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT synced_at FROM sync_state WHERE resource = ?', (resource,)
+            ).fetchone()
+
+        return date.fromisoformat(row[0]) if row else None
+
+    def _mark_synced(
+        self,
+        resource: str,
+        day: date
+    ) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO sync_state (resource, synced_at) VALUES (?, ?)',
+                (resource, day.isoformat())
+            )
+
+    def _fetch(
+        self,
+        resource: str,
+        params: dict,
+        concurrency: int = 1
+    ) -> Iterator[dict]:
+        return self.asaas.paginate(resource, params, lambda item: item, concurrency=concurrency)
+
+    def _created_since(
+        self,
+        resource: str,
+        params: dict,
+        since: date,
+        newest_first: bool = False
+    ) -> Iterator[dict]:
+        """Objects created on or after since
+
+        With newest_first, which the params must request explicitly, the scan
+        stops at the first older object; otherwise every page is read.
+        """
+
+        for item in self._fetch(resource, params):
+            if (item.get('dateCreated') or '')[:10] < since.isoformat():
+                if newest_first:
+                    return
+
+                continue
+
+            yield item
+
+    def backfill(
+        self,
+        resources: Iterable[str] = RESOURCES,
+        concurrency: int = 1
+    ) -> dict:
+        """Load every object of the given resources, returning counts per resource"""
+
+        counts = {}
+
+        for resource in resources:
+            started = date.today()
+            counts[resource] = self.upsert(resource, self._fetch(resource, {}, concurrency))
+            self._mark_synced(resource, started)
+
+        return counts
+
+    def refresh(
+        self,
+        resources: Iterable[str] = RESOURCES
+    ) -> dict:
+        """Fetch what changed since the last sync, backfilling resources never synced
+
+        Dates are inclusive, so the day of the last sync is fetched again.
+        Counts are of distinct objects written per resource.
+        """
+
+        counts = {}
+
+        for resource in resources:
+            since = self.synced_at(resource)
+
+            if since is None:
+                counts.update(self.backfill((resource,)))
+
+                continue
+
+            started = date.today()
+            # The payment windows overlap, so count each object once
+            ids = set()
+
+            def track(items: Iterable[dict]) -> Iterator[dict]:
+                for item in items:
+                    ids.add(item['id'])
+                    yield item
+
+            if resource == 'payments':
+                for params in (
+                    {'dateCreatedGreaterThanOrEqual': since},
+                    {'paymentDateGreaterThanOrEqual': since},
+                    {'dueDateGreaterThanOrEqual': since, 'dueDateLessThanOrEqual': started}
+                ):
+                    self.upsert(resource, track(self._fetch(resource, params)))
+
+            elif resource == 'subscriptions':
+                self.upsert(resource, track(self._created_since(
+                    resource,
+                    {'sort': subscriptions.Sort.DATE_CREATED, 'order': subscriptions.Order.DESC},
+                    since,
+                    newest_first=True
+                )))
+
+            else:
+                # The customer list has no date filter nor sort option, so its
+                # order is not relied on: every page is read
+                self.upsert(resource, track(self._created_since(resource, {}, since)))
+
+            counts[resource] = len(ids)
+            self._mark_synced(resource, started)
+
+        return counts
+
+    def _select(
+        self,
+        resource: str,
+        filters: dict,
+        offset: Optional[int],
+        limit: Optional[int]
+    ) -> list:
+        conditions = []
+        values = []
+
+        for name, value in filters.items():
+            if value is None:
+                continue
+
+            operator = '='
+
+            for suffix, range_operator in RANGE_SUFFIXES.items():
+                if name.endswith(suffix):
+                    name = name[:-len(suffix)]
+                    operator = range_operator
+
+            conditions.append(f'{name} {operator} ?')
+            values.append(value.isoformat() if isinstance(value, date) else value)
+
+        query = f'SELECT data FROM {resource}'
+
+        if conditions:
+            query += f' WHERE {" AND ".join(conditions)}'
+
+        query += ' ORDER BY dateCreated DESC, id DESC'
+
+        if limit is not None or offset:
+            query += ' LIMIT ? OFFSET ?'
+            values += [-1 if limit is None else limit, offset or 0]
+
+        with self.lock:
+            rows = self.connection.execute(query, values).fetchall()
+
+        loads = self.asaas.json_backend.loads
+        converter: Callable[[dict], object] = self.converters[resource]
+
+        return [converter(loads(row[0])) for row in rows]
+
+    def _get(
+        self,
+        resource: str,
+        id: str
+    ) -> Optional[object]:
+        result = self._select(resource, {'id': id}, None, None)
+
+        return result[0] if result else None
+
+    def retrieve_customer(
+        self,
+        customer_id: str
+    ) -> Optional[customer.Customer]:
+        """Retrieve a single customer from the mirror"""
+
+        return self._get('customers', customer_id)
+
+    def list_customers(
+        self,
+        cpfCnpj: Optional[str] = None,
+        email: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[customer.Customer]:
+        """List mirrored customers, newest first"""
+
+        return self._select(
+            'customers',
+            {
+                'cpfCnpj': cpfCnpj,
+                'email': email,
+                'externalReference': externalReference
+            },
+            offset,
+            limit
+        )
+
+    def retrieve_payment(
+        self,
+        payment_id: str
+    ) -> Optional[payments.Payment]:
+        """Retrieve a single payment from the mirror"""
+
+        return self._get('payments', payment_id)
+
+    def list_payments(
+        self,
+        customer: Optional[str] = None,
+        subscription: Optional[str] = None,
+        installment: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        status: Optional[payments.Status] = None,
+        billingType: Optional[payments.BillingType] = None,
+        dueDateGreaterThanOrEqual: Optional[date] = None,
+        dueDateLessThanOrEqual: Optional[date] = None,
+        paymentDateGreaterThanOrEqual: Optional[date] = None,
+        paymentDateLessThanOrEqual: Optional[date] = None,
+        dateCreatedGreaterThanOrEqual: Optional[date] = None,
+        dateCreatedLessThanOrEqual: Optional[date] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[payments.Payment]:
+        """List mirrored payments, newest first"""
+
+        return self._select(
+            'payments',
+            {
+                'customer': customer,
+                'subscription': subscription,
+                'installment': installment,
+                'externalReference': externalReference,
+                'status': status,
+                'billingType': billingType,
+                'dueDateGreaterThanOrEqual': dueDateGreaterThanOrEqual,
+                'dueDateLessThanOrEqual': dueDateLessThanOrEqual,
+                'paymentDateGreaterThanOrEqual': paymentDateGreaterThanOrEqual,
+                'paymentDateLessThanOrEqual': paymentDateLessThanOrEqual,
+                'dateCreatedGreaterThanOrEqual': dateCreatedGreaterThanOrEqual,
+                'dateCreatedLessThanOrEqual': dateCreatedLessThanOrEqual
+            },
+            offset,
+            limit
+        )
+
+    def retrieve_subscription(
+        self,
+        subscription_id: str
+    ) -> Optional[subscriptions.Subscription]:
+        """Retrieve a single subscription from the mirror"""
+
+        return self._get('subscriptions', subscription_id)
+
+    def list_subscriptions(
+        self,
+        customer: Optional[str] = None,
+        externalReference: Optional[str] = None,
+        status: Optional[subscriptions.Status] = None,
+        billingType: Optional[subscriptions.BillingType] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[subscriptions.Subscription]:
+        """List mirrored subscriptions, newest first"""
+
+        return self._select(
+            'subscriptions',
+            {
+                'customer': customer,
+                'externalReference': externalReference,
+                'status': status,
+                'billingType': billingType
+            },
+            offset,
+            limit
+        )
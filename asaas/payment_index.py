@@ -0,0 +1,260 @@
+from asaas import (
+    MAX_PAGE_SIZE,
+    payments
+)
+from asaas.webhooks import (
+    ANY_EVENT,
+    Event,
+    WebhookEvent,
+    WebhookReceiver
+)
+
+from typing import (
+    Any,
+    Optional,
+    Union
+)
+
+import threading
+import time
+
+PAID_STATUSES = frozenset((
+    payments.Status.RECEIVED,
+    payments.Status.CONFIRMED,
+    payments.Status.RECEIVED_IN_CASH
+))
+
+
+# Order payments move through, used to break ties between notifications
+# created in the same second (dateCreated has one-second resolution)
+LIFECYCLE = (
+    (payments.Status.PENDING, payments.Status.AWAITING_RISK_ANALYSIS),
+    (payments.Status.OVERDUE,),
+    (payments.Status.DUNNING_REQUESTED,),
+    (payments.Status.CONFIRMED,),
+    (payments.Status.RECEIVED, payments.Status.RECEIVED_IN_CASH, payments.Status.DUNNING_RECEIVED),
+    (payments.Status.REFUND_REQUESTED, payments.Status.CHARGEBACK_REQUESTED),
+    (payments.Status.REFUND_IN_PROGRESS, payments.Status.CHARGEBACK_DISPUTE),
+    (payments.Status.AWAITING_CHARGEBACK_REVERSAL,),
+    (payments.Status.REFUNDED,)
+)
+STAGES = {status: stage for stage, statuses in enumerate(LIFECYCLE) for status in statuses}
+DELETED_STAGE = len(LIFECYCLE)
+
+
+def _stage(value: Optional[str]) -> Optional[int]:
+    """Lifecycle stage of a status (deleted last), None when unknown"""
+
+    return DELETED_STAGE if value is None else STAGES.get(value)
+
+
+def _status(value: str) -> Union[payments.Status, str]:
+    try:
+        return payments.Status(value)
+    except ValueError:
+        return value
+
+
+class PaymentStatusIndex:
+    """In-process status of payments, by id and by externalReference
+
+    Seed it once from the list endpoint and keep it current with webhook
+    notifications (attach it to a WebhookReceiver, or call apply). Lookups
+    are plain dict reads; the API is only asked, through retrieve_status,
+    for payments missing from the index or last updated more than max_age
+    seconds ago (never, when max_age is None).
+
+    Webhook handlers run on several threads, so notifications of a payment
+    may be applied out of order; each entry keeps the dateCreated of the
+    notification it came from, and older notifications are ignored. Ties
+    within the same second are broken by the payment lifecycle (e.g.
+    RECEIVED is kept over a CONFIRMED of the same second). externalReference
+    entries are dropped with their payment.
+    """
+
+    def __init__(
+        self,
+        asaas: Any,
+        max_age: Optional[float] = None
+    ) -> None:
+        self.asaas = asaas
+        self.max_age = max_age
+        self._statuses = {}
+        self._references = {}
+        self._lock = threading.Lock()
+
+    def _set(
+        self,
+        payment_id: str,
+        status: Optional[str],
+        externalReference: Optional[str] = None,
+        event_time: Optional[str] = None
+    ) -> None:
+        """Store a status; None marks a deleted payment, to be asked to the API
+
+        Without event_time the status was fetched from the API, so it is at
+        least as new as the last notification and always stored.
+        """
+
+        with self._lock:
+            current = self._statuses.get(payment_id)
+
+            if current is not None and current[2] is not None:
+                if event_time is None:
+                    event_time = current[2]
+
+                elif event_time < current[2]:
+                    return
+
+                elif event_time == current[2]:
+                    new_stage, current_stage = _stage(status), _stage(current[0])
+
+                    if None not in (new_stage, current_stage) and new_stage < current_stage:
+                        return
+
+            reference = externalReference or (current[3] if current is not None else None)
+
+            if status is None:
+                self._forget_reference(payment_id, reference)
+                reference = None
+
+            elif externalReference:
+                self._references[externalReference] = payment_id
+
+            self._statuses[payment_id] = (
+                _status(status) if status is not None else None,
+                time.monotonic(),
+                event_time,
+                reference
+            )
+
+    def _forget_reference(
+        self,
+        payment_id: str,
+        reference: Optional[str]
+    ) -> None:
+        """Drop the externalReference of a payment, unless it points to another one now"""
+
+        if reference and self._references.get(reference) == payment_id:
+            del self._references[reference]
+
+    def seed(
+        self,
+        customer: Optional[str] = None,
+        status: Optional[payments.Status] = None,
+        dateCreatedGreaterThanOrEqual: Optional[Any] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1
+    ) -> int:
+        """Load the status of every listed payment, returning how many were indexed"""
+
+        count = 0
+
+        for payment in self.asaas.payments.iter_all(
+            customer=customer,
+            status=status,
+            dateCreatedGreaterThanOrEqual=dateCreatedGreaterThanOrEqual,
+            page_size=page_size,
+            concurrency=concurrency
+        ):
+            if payment.deleted:
+                continue
+
+            self._set(payment.id, payment.status, payment.externalReference)
+            count += 1
+
+        return count
+
+    def apply(
+        self,
+        event: Union[WebhookEvent, dict]
+    ) -> None:
+        """Update the index from a webhook notification"""
+
+        data = event.data if isinstance(event, WebhookEvent) else event
+        payment = data.get('payment')
+
+        if not payment:
+            return
+
+        # Notification times are 'YYYY-MM-DD HH:MM:SS', so they sort as strings
+        event_time = data.get('dateCreated')
+
+        if data.get('event') == Event.PAYMENT_DELETED or payment.get('deleted'):
+            self._set(payment['id'], None, event_time=event_time)
+
+            return
+
+        self._set(payment['id'], payment['status'], payment.get('externalReference'), event_time)
+
+    def attach(
+        self,
+        receiver: WebhookReceiver
+    ) -> 'PaymentStatusIndex':
+        """Apply every notification of a webhook receiver"""
+
+        receiver.on(ANY_EVENT, self.apply)
+
+        return self
+
+    def discard(
+        self,
+        payment_id: str
+    ) -> None:
+        """Forget a payment, so its next lookup asks the API"""
+
+        with self._lock:
+            entry = self._statuses.pop(payment_id, None)
+
+            if entry is not None:
+                self._forget_reference(payment_id, entry[3])
+
+    def status(
+        self,
+        payment_id: str
+    ) -> Union[payments.Status, str]:
+        """Status of a payment, from the index when it is fresh"""
+
+        entry = self._statuses.get(payment_id)
+
+        if (
+            entry is not None
+            and entry[0] is not None
+            and (self.max_age is None or time.monotonic() - entry[1] <= self.max_age)
+        ):
+            return entry[0]
+
+        status = self.asaas.payments.retrieve_status(payment_id)
+        self._set(payment_id, status)
+
+        return _status(status)
+
+    def status_by_reference(
+        self,
+        externalReference: str
+    ) -> Optional[Union[payments.Status, str]]:
+        """Status of the latest payment seen with an externalReference, or None"""
+
+        payment_id = self._references.get(externalReference)
+
+        if payment_id is None:
+            found = self.asaas.payments.list(externalReference=externalReference, limit=1)
+
+            if not found:
+                return None
+
+            payment_id = found[0].id
+            self._set(payment_id, found[0].status, externalReference)
+
+        return self.status(payment_id)
+
+    def is_paid(
+        self,
+        payment_id: str
+    ) -> bool:
+        """Whether a payment is RECEIVED, CONFIRMED or RECEIVED_IN_CASH"""
+
+        return self.status(payment_id) in PAID_STATUSES
+
+    def __len__(self) -> int:
+        return sum(1 for entry in list(self._statuses.values()) if entry[0] is not None)
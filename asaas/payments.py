@@ -1,9 +1,9 @@
 from typing import Optional
 from datetime import date
-from enum import Enum
+from enum import StrEnum
 
 
-class Status:
+class Status(StrEnum):
     """Status for payment"""
 
     PENDING = 'PENDING'
@@ -22,7 +22,7 @@ class Status:
     AWAITING_RISK_ANALYSIS = 'AWAITING_RISK_ANALYSIS'
 
 
-class BillingType:
+class BillingType(StrEnum):
     """Billing type for payment"""
 
     BOLETO = 'BOLETO'
@@ -44,6 +44,12 @@ class Discount:
         FIXED = 'FIXED'
         PERCENTAGE = 'PERCENTAGE'
 
+    __slots__ = (
+        'value',
+        'dueDateLimitDays',
+        'type'
+    )
+
     def __init__(
         self,
         value: int,
@@ -66,6 +72,10 @@ class Discount:
 class Interest:
     """Interest object for payment"""
 
+    __slots__ = (
+        'value',
+    )
+
     def __init__(
         self,
         value: float,
@@ -86,6 +96,11 @@ class Fine:
         FIXED = 'FIXED'
         PERCENTAGE = 'PERCENTAGE'
 
+    __slots__ = (
+        'value',
+        'type'
+    )
+
     def __init__(
         self,
         value: float,
@@ -109,6 +124,14 @@ class Refund:
         CANCELLED = 'CANCELLED'
         DONE = 'DONE'
 
+    __slots__ = (
+        'dateCreated',
+        'status',
+        'value',
+        'description',
+        'transactionReceiptUrl'
+    )
+
     def __init__(
         self,
         dateCreated: str,
@@ -137,6 +160,13 @@ class Refund:
 class Split:
     """Split object for payment"""
 
+    __slots__ = (
+        'walletId',
+        'fixedValue',
+        'percentageValue',
+        'totalFixedValue'
+    )
+
     def __init__(
         self,
         walletId: str,
@@ -205,10 +235,35 @@ class Chargeback:
         VISA_FRAUD_MONITORING_PROGRAM = 'VISA_FRAUD_MONITORING_PROGRAM'
         WARNING_BULLETIN_FILE = 'WARNING_BULLETIN_FILE'
 
+    __slots__ = (
+        'status',
+        'reason'
+    )
+
+    def __init__(
+        self,
+        status: Status,
+        reason: Reason,
+        **kwargs
+    ) -> None:
+        self.status = status
+        self.reason = reason
+
+    def to_dict(self) -> dict:
+        return {
+            'status': self.status,
+            'reason': self.reason
+        }
+
 
 class Callback:
     """Callback object for payment"""
 
+    __slots__ = (
+        'sucessUrl',
+        'autoRedirect'
+    )
+
     def __init__(
         self,
         sucessUrl: str,
@@ -227,6 +282,46 @@ class Callback:
 class Payment:
     """ Payment object for Asaas API """
 
+    __slots__ = (
+        'id',
+        'customer',
+        'dateCreated',
+        'dueDate',
+        'value',
+        'installment',
+        'subscription',
+        'paymentLink',
+        'netValue',
+        'billingType',
+        'status',
+        'description',
+        'externalReference',
+        'canBePaidAfterDueDate',
+        'pixTransaction',
+        'pixQrCodeId',
+        'originalValue',
+        'interestValue',
+        'originalDueDate',
+        'paymentDate',
+        'clientPaymentDate',
+        'installmentNumber',
+        'transactionReceiptUrl',
+        'duplicatedPayment',
+        'nossoNumero',
+        'invoiceUrl',
+        'bankSlipUrl',
+        'invoiceNumber',
+        'discount',
+        'fine',
+        'interest',
+        'deleted',
+        'postalService',
+        'anticipated',
+        'anticipable',
+        'refunds',
+        'split'
+    )
+
     def __init__(
         self,
         id: str,
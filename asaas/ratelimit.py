@@ -0,0 +1,70 @@
+from asaas.utils import parse_retry_after
+
+from typing import Optional
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by every request of one or more clients
+
+    Implemented as a generic cell rate algorithm: each request reserves the
+    next slot on a virtual timeline, so bursts of up to ``burst`` requests go
+    through immediately and the sustained rate never exceeds ``rate`` per
+    second. Safe to share between threads and between sync and async clients.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None
+    ) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._interval = 1 / rate
+        self._tolerance = (max(self.burst, 1) - 1) * self._interval
+        self._theoretical_arrival = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, returning how many seconds to wait before using it"""
+
+        with self._lock:
+            now = time.monotonic()
+            arrival = max(self._theoretical_arrival, now)
+            self._theoretical_arrival = arrival + self._interval
+
+        return max(0.0, arrival - self._tolerance - now)
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+
+        wait = self.reserve()
+
+        if wait:
+            time.sleep(wait)
+
+    def pause(
+        self,
+        seconds: float
+    ) -> None:
+        """Hold back every caller for the given seconds, e.g. after an HTTP 429"""
+
+        with self._lock:
+            resume = time.monotonic() + seconds + self._tolerance
+            self._theoretical_arrival = max(self._theoretical_arrival, resume)
+
+
+def rate_limit_delay(
+    response,
+    attempt: int
+) -> float:
+    """Seconds to wait after an HTTP 429, from Retry-After or exponential backoff"""
+
+    delay = parse_retry_after(response.headers.get('Retry-After'))
+
+    return delay if delay is not None else 2 ** attempt
@@ -0,0 +1,199 @@
+from asaas import payments
+from asaas.columnar import (
+    BILLING_TYPE_CATEGORIES,
+    STATUS_CATEGORIES,
+    PaymentBatch
+)
+
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    Sequence
+)
+
+from datetime import date
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+AMOUNTS = ('value', 'netValue', 'interestValue', 'fee')
+OPEN_STATUSES = (payments.Status.PENDING, payments.Status.OVERDUE)
+
+
+def _amounts(batch: PaymentBatch) -> 'numpy.ndarray':
+    """Rows of value, netValue, interestValue and fee (value minus netValue), in cents"""
+
+    return numpy.column_stack((
+        batch['value'],
+        batch['netValue'],
+        batch['interestValue'],
+        batch['value'] - batch['netValue']
+    ))
+
+
+def _group(
+    codes: 'numpy.ndarray',
+    amounts: 'numpy.ndarray',
+    size: int
+) -> 'numpy.ndarray':
+    """Count and amount totals per code, one row per code"""
+
+    totals = numpy.zeros((size, 1 + len(AMOUNTS)), dtype=numpy.int64)
+    totals[:, 0] = numpy.bincount(codes, minlength=size)
+
+    for column in range(len(AMOUNTS)):
+        totals[:, column + 1] = numpy.rint(
+            numpy.bincount(codes, weights=amounts[:, column], minlength=size)
+        )
+
+    return totals
+
+
+def _row(totals: 'numpy.ndarray') -> Dict[str, int]:
+    return dict(zip(('count',) + AMOUNTS, (int(total) for total in totals)))
+
+
+class Reconciliation:
+    """Running receivable totals over a stream of payment batches
+
+    Each batch is reduced to fixed size arrays as soon as it is added, so
+    memory depends on the number of statuses, billing types and months, not
+    on the number of payments. Amounts are int64 cents and fee is value
+    minus netValue.
+
+    Open payments (PENDING or OVERDUE) due before as_of are aged by days
+    overdue into the buckets 1 to ageing_buckets[0], ..., and above the last
+    edge.
+    """
+
+    def __init__(
+        self,
+        as_of: Optional[date] = None,
+        ageing_buckets: Sequence[int] = (30, 60, 90)
+    ) -> None:
+        if numpy is None:
+            raise ImportError(
+                'Reconciliation requires numpy, install it with "pip install asaas-sdk-wlc[columnar]"'
+            )
+
+        self.as_of = numpy.datetime64(as_of or date.today(), 'D')
+        self.ageing_buckets = numpy.array(ageing_buckets, dtype=numpy.int64)
+        self.totals = numpy.zeros(1 + len(AMOUNTS), dtype=numpy.int64)
+        self.by_status = numpy.zeros((len(STATUS_CATEGORIES), 1 + len(AMOUNTS)), dtype=numpy.int64)
+        self.by_billing_type = numpy.zeros((len(BILLING_TYPE_CATEGORIES), 1 + len(AMOUNTS)), dtype=numpy.int64)
+        self.by_due_month = {}
+        self.by_payment_month = {}
+        self.ageing = numpy.zeros((len(ageing_buckets) + 1, 1 + len(AMOUNTS)), dtype=numpy.int64)
+        self.open_codes = numpy.array([STATUS_CATEGORIES.index(status) for status in OPEN_STATUSES])
+
+    def add(
+        self,
+        batch: PaymentBatch
+    ) -> 'Reconciliation':
+        """Fold a batch into the totals"""
+
+        if not len(batch):
+            return self
+
+        amounts = _amounts(batch)
+
+        self.totals[0] += len(batch)
+        self.totals[1:] += amounts.sum(axis=0)
+
+        for totals, column in ((self.by_status, 'status'), (self.by_billing_type, 'billingType')):
+            codes = batch[column]
+            known = codes >= 0
+            totals += _group(codes[known], amounts[known], len(totals))
+
+        self._add_months(self.by_due_month, batch['dueDate'], amounts)
+        self._add_months(self.by_payment_month, batch['paymentDate'], amounts)
+
+        due = batch['dueDate']
+        overdue = (
+            numpy.isin(batch['status'], self.open_codes)
+            & ~numpy.isnat(due)
+            & (due < self.as_of)
+        )
+        days = (self.as_of - due[overdue]).astype(numpy.int64)
+        buckets = numpy.searchsorted(self.ageing_buckets, days, side='left')
+        self.ageing += _group(buckets, amounts[overdue], len(self.ageing))
+
+        return self
+
+    def _add_months(
+        self,
+        months: Dict[str, 'numpy.ndarray'],
+        dates: 'numpy.ndarray',
+        amounts: 'numpy.ndarray'
+    ) -> None:
+        known = ~numpy.isnat(dates)
+        keys, codes = numpy.unique(dates[known].astype('datetime64[M]'), return_inverse=True)
+
+        for key, totals in zip(keys, _group(codes.ravel(), amounts[known], len(keys))):
+            key = str(key)
+
+            if key in months:
+                months[key] += totals
+            else:
+                months[key] = totals
+
+    def ageing_labels(self) -> list:
+        """Label of each ageing bucket, in days overdue"""
+
+        edges = [int(edge) for edge in self.ageing_buckets]
+        labels = []
+        start = 1
+
+        for edge in edges:
+            labels.append(f'{start}-{edge}')
+            start = edge + 1
+
+        labels.append(f'{start}+')
+
+        return labels
+
+    def summary(self) -> dict:
+        """Totals as plain dicts of count, value, netValue, interestValue and fee"""
+
+        return {
+            'as_of': str(self.as_of),
+            'total': _row(self.totals),
+            'by_status': {
+                str(status): _row(totals)
+                for status, totals in zip(STATUS_CATEGORIES, self.by_status)
+                if totals[0]
+            },
+            'by_billing_type': {
+                str(billing_type): _row(totals)
+                for billing_type, totals in zip(BILLING_TYPE_CATEGORIES, self.by_billing_type)
+                if totals[0]
+            },
+            'by_due_month': {
+                month: _row(self.by_due_month[month]) for month in sorted(self.by_due_month)
+            },
+            'by_payment_month': {
+                month: _row(self.by_payment_month[month]) for month in sorted(self.by_payment_month)
+            },
+            'overdue_ageing': {
+                label: _row(totals)
+                for label, totals in zip(self.ageing_labels(), self.ageing)
+            }
+        }
+
+
+def reconcile(
+    batches: Iterable[PaymentBatch],
+    as_of: Optional[date] = None,
+    ageing_buckets: Sequence[int] = (30, 60, 90)
+) -> dict:
+    """Summarize every batch of an iterator, see Reconciliation"""
+
+    reconciliation = Reconciliation(as_of, ageing_buckets)
+
+    for batch in batches:
+        reconciliation.add(batch)
+
+    return reconciliation.summary()
@@ -0,0 +1,159 @@
+from asaas.utils import parse_retry_after
+
+from typing import (
+    Iterable,
+    Optional
+)
+
+from collections import Counter
+
+import random
+import threading
+
+import requests
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+DEFAULT_STATUSES = (500, 502, 503, 504)
+DEFAULT_METHODS = ('GET', 'PUT', 'DELETE')
+DEFAULT_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout
+) + ((httpx.TransportError,) if httpx is not None else ())
+
+
+class RetryStats:
+    """Thread-safe counters of the retries made under a policy"""
+
+    def __init__(self) -> None:
+        self.retries = 0
+        self.exhausted = 0
+        self.by_status = Counter()
+        self.by_exception = Counter()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        with self._lock:
+            self.retries += 1
+
+            if status_code is not None:
+                self.by_status[status_code] += 1
+
+            if error is not None:
+                self.by_exception[type(error).__name__] += 1
+
+    def record_exhausted(self) -> None:
+        with self._lock:
+            self.exhausted += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'retries': self.retries,
+                'exhausted': self.exhausted,
+                'by_status': dict(self.by_status),
+                'by_exception': dict(self.by_exception)
+            }
+
+
+class Retry:
+    """Retry policy with exponential backoff and full jitter
+
+    A request is retried when its method is allowed and it either failed with
+    one of the given exceptions or got one of the given status codes, up to
+    max_attempts attempts in total. Retry-After is honoured when the server
+    sends one. Only idempotent verbs are retried by default. With
+    idempotent_writes, writes sent with an Idempotency-Key header (creates
+    and refunds) are retried too; that is only safe when the server
+    deduplicates requests by that header.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        statuses: Iterable[int] = DEFAULT_STATUSES,
+        exceptions: Iterable[type] = DEFAULT_EXCEPTIONS,
+        methods: Iterable[str] = DEFAULT_METHODS,
+        idempotent_writes: bool = False
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.idempotent_writes = idempotent_writes
+        self.stats = RetryStats()
+
+    def allows(
+        self,
+        method: str,
+        idempotent: bool = False
+    ) -> bool:
+        """Whether requests with this method may be retried"""
+
+        return method.upper() in self.methods or (idempotent and self.idempotent_writes)
+
+    def backoff(
+        self,
+        attempt: int
+    ) -> float:
+        """Seconds to wait before the retry following the given attempt"""
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def delay_for_status(
+        self,
+        method: str,
+        attempt: int,
+        response,
+        idempotent: bool = False
+    ) -> Optional[float]:
+        """Seconds to wait before retrying a response, or None to give up"""
+
+        if response.status_code not in self.statuses or not self.allows(method, idempotent):
+            return None
+
+        if attempt + 1 >= self.max_attempts:
+            self.stats.record_exhausted()
+
+            return None
+
+        self.stats.record(status_code=response.status_code)
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+
+        return max(self.backoff(attempt), retry_after or 0.0)
+
+    def delay_for_exception(
+        self,
+        method: str,
+        attempt: int,
+        error: BaseException,
+        idempotent: bool = False
+    ) -> Optional[float]:
+        """Seconds to wait before retrying a failed request, or None to give up"""
+
+        if not isinstance(error, self.exceptions) or not self.allows(method, idempotent):
+            return None
+
+        if attempt + 1 >= self.max_attempts:
+            self.stats.record_exhausted()
+
+            return None
+
+        self.stats.record(error=error)
+
+        return self.backoff(attempt)
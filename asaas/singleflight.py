@@ -0,0 +1,90 @@
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Hashable
+)
+
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into a single call
+
+    The first thread to ask for a key runs the call, the others wait for it
+    and receive the same result, or the same exception.
+    """
+
+    def __init__(self) -> None:
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        call: Callable[[], Any]
+    ) -> Any:
+        with self._lock:
+            pending = self._calls.get(key)
+
+            if pending is None:
+                pending = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            pending.done.wait()
+
+            if pending.error is not None:
+                raise pending.error
+
+            return pending.result
+
+        try:
+            pending.result = call()
+
+        except BaseException as error:
+            pending.error = error
+
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            pending.done.set()
+
+        return pending.result
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent coroutines with the same key into a single task
+
+    The task is shielded, so cancelling one of the callers does not cancel
+    the call the others are waiting for.
+    """
+
+    def __init__(self) -> None:
+        self._calls = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        task = self._calls.get(key)
+
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(call())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(task)
@@ -0,0 +1,141 @@
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    Optional
+)
+
+from json import (
+    JSONDecodeError,
+    JSONDecoder
+)
+
+import codecs
+
+WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """Text buffer over a stream of byte chunks, refilled on demand"""
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes]
+    ) -> None:
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json = JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping what was already consumed"""
+
+        if self.exhausted:
+            return False
+
+        for chunk in self.chunks:
+            text = self.decoder.decode(chunk)
+
+            if text:
+                self.buffer = self.buffer[self.position:] + text
+                self.position = 0
+
+                return True
+
+        self.exhausted = True
+        self.buffer = self.buffer[self.position:] + self.decoder.decode(b'', final=True)
+        self.position = 0
+
+        return bool(self.buffer)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or an empty string at the end"""
+
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.fill():
+                return ''
+
+    def expect(
+        self,
+        character: str
+    ) -> None:
+        found = self.peek()
+
+        if found != character:
+            raise JSONDecodeError(f'Expecting {character!r}', self.buffer, self.position)
+
+        self.position += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.position)
+
+            except JSONDecodeError:
+                if self.fill():
+                    continue
+
+                raise
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.position = end
+
+            return value
+
+
+def iter_list_items(
+    chunks: Iterable[bytes],
+    key: str = 'data',
+    meta: Optional[dict] = None
+) -> Iterator[Any]:
+    """Yield the items of the key array of a JSON object as they are decoded
+
+    Only the item being decoded is kept in memory. Every other member of the
+    object (hasMore, totalCount...) is stored in meta, if given, as soon as
+    it has been read.
+    """
+
+    reader = _Reader(chunks)
+    reader.expect('{')
+
+    while reader.peek() != '}':
+        if reader.peek() == ',':
+            reader.position += 1
+
+        name = reader.value()
+        reader.expect(':')
+
+        if name != key:
+            value = reader.value()
+
+            if meta is not None:
+                meta[name] = value
+
+            continue
+
+        reader.expect('[')
+
+        while reader.peek() != ']':
+            if reader.peek() == ',':
+                reader.position += 1
+
+            yield reader.value()
+
+        reader.position += 1
+
+    reader.expect('}')
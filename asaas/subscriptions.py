@@ -1,11 +1,11 @@
-from enum import Enum
+from enum import StrEnum
 from typing import Optional
 from asaas import payments
 
 from datetime import date
 
 
-class Cycle:
+class Cycle(StrEnum):
     """Cycle for payment of subscription"""
 
     WEEKLY = 'WEEKLY'
@@ -17,7 +17,7 @@ class Cycle:
     ANNUALLY = 'ANNUALLY'
 
 
-class BillingType:
+class BillingType(StrEnum):
     """Billing type for payment of subscription"""
 
     BOLETO = 'BOLETO'
@@ -26,7 +26,7 @@ class BillingType:
     PIX = 'PIX'
 
 
-class Status:
+class Status(StrEnum):
     """Status of subscription"""
 
     ACTIVE = 'ACTIVE'
@@ -34,14 +34,14 @@ class Status:
     EXPIRED = 'EXPIRED'
 
 
-class Order:
+class Order(StrEnum):
     """Order for subscription"""
 
     ASC = 'asc'
     DESC = 'desc'
 
 
-class Sort:
+class Sort(StrEnum):
     """Sort for subscription"""
 
     ID = 'id'
@@ -64,6 +64,27 @@ class Sort:
 
 class Subscription:
 
+    __slots__ = (
+        'id',
+        'dateCreated',
+        'customer',
+        'billingType',
+        'cycle',
+        'value',
+        'nextDueDate',
+        'status',
+        'endDate',
+        'paymentLink',
+        'description',
+        'discount',
+        'fine',
+        'interest',
+        'deleted',
+        'maxPayments',
+        'externalReference',
+        'split'
+    )
+
     def __init__(
         self,
         id: str,
@@ -119,11 +140,11 @@ class Subscription:
             'id': self.id,
             'dateCreated': self.dateCreated.isoformat(),
             'customer': self.customer,
-            'billingType': self.billingType.value,
+            'billingType': self.billingType,
             'cycle': self.cycle,
             'value': self.value,
             'nextDueDate': self.nextDueDate.isoformat(),
-            'status': self.status.value,
+            'status': self.status,
             'endDate': self.endDate.isoformat() if self.endDate else None,
             'paymentLink': self.paymentLink,
             'description': self.description,
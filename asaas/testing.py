@@ -0,0 +1,476 @@
+from asaas import (
+    payments,
+    status,
+    subscriptions
+)
+from asaas.transport import Transport
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+from collections import Counter
+from datetime import (
+    date,
+    timedelta
+)
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+import itertools
+import json
+import requests
+import threading
+import time
+
+RESOURCES = ('customers', 'payments', 'subscriptions')
+PAID_STATUSES = (payments.Status.RECEIVED, payments.Status.CONFIRMED, payments.Status.RECEIVED_IN_CASH)
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+# List filters the fake accepts but does not apply
+IGNORED_FILTERS = ('customerGroupName', 'groupName', 'user', 'invoiceStatus', 'pixQrCodeId')
+
+RANGE_SUFFIXES = (
+    ('GreaterThanOrEqual', lambda field, value: field is not None and field >= value),
+    ('LessThanOrEqual', lambda field, value: field is not None and field <= value)
+)
+
+
+class FakeError(Exception):
+    """Error answered by the fake API"""
+
+    def __init__(
+        self,
+        status_code: int,
+        code: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> None:
+        super().__init__(description)
+        self.status_code = status_code
+        self.code = code
+        self.description = description
+
+    def payload(self) -> dict:
+        if self.code is None:
+            return {}
+
+        return {'errors': [{'code': self.code, 'description': self.description}]}
+
+
+def _param(value: Any) -> str:
+    """A query parameter as requests would send it"""
+
+    if isinstance(value, date):
+        return value.isoformat()
+
+    if isinstance(value, bool):
+        return str(value).lower()
+
+    return str(value)
+
+
+def _value(value: Any) -> Optional[str]:
+    """A stored field in the form query parameters are compared with"""
+
+    if value is None:
+        return None
+
+    if isinstance(value, bool):
+        return str(value).lower()
+
+    return str(value)
+
+
+class FakeAsaas(Transport):
+    """In-memory Asaas API, used as the transport of a client
+
+    Keeps customers, payments and subscriptions in dicts and answers the
+    endpoints the SDK calls: create, retrieve, list (with filters, offset and
+    limit), update, delete, restore, payment status and refund, and the
+    payments of a subscription. Errors use the same 400 and 404 shapes as
+    the API, so raise_for_status raises the same exceptions.
+
+        asaas = Asaas(api_key='test', transport=FakeAsaas())
+
+    latency adds a fixed delay to every request. payment_fee is taken from
+    value to compute netValue. receive_payment and overdue_payment move
+    payments through their lifecycle like the real API would.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0,
+        payment_fee: float = 0.99,
+        today: Optional[Callable[[], date]] = None
+    ) -> None:
+        self.latency = latency
+        self.payment_fee = payment_fee
+        self.today = today or date.today
+        self.objects: Dict[str, Dict[str, dict]] = {resource: {} for resource in RESOURCES}
+        self.calls = Counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def new_id(
+        self,
+        prefix: str
+    ) -> str:
+        return f'{prefix}_{next(self._ids):012d}'
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        params: Optional[dict] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        started = time.perf_counter()
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        segments = urlsplit(url).path.strip('/').split('/')
+        resource_at = next(
+            (index for index, segment in enumerate(segments) if segment in RESOURCES),
+            len(segments)
+        )
+        path = segments[resource_at:]
+        query = {name: _param(value) for name, value in (params or {}).items() if value is not None}
+        body = json.loads(data) if data else {}
+
+        with self._lock:
+            self.calls[method] += 1
+
+            try:
+                code, payload = self.route(method, path, query, body)
+
+            except FakeError as error:
+                code, payload = error.status_code, error.payload()
+
+            # Serialized under the lock, since payloads are the stored objects
+            return self.response(code, payload, url, time.perf_counter() - started)
+
+    def response(
+        self,
+        code: int,
+        payload: Any,
+        url: str,
+        elapsed: float
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = code
+        response.reason = HTTPStatus(code).phrase
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response.elapsed = timedelta(seconds=elapsed)
+        response._content = json.dumps(payload).encode()
+        response._content_consumed = True
+
+        return response
+
+    def route(
+        self,
+        method: str,
+        path: List[str],
+        query: dict,
+        body: dict
+    ) -> Tuple[int, Any]:
+        if not path:
+            raise FakeError(status.HTTP_404_NOT_FOUND)
+
+        resource, rest = path[0], path[1:]
+
+        if not rest:
+            if method == 'GET':
+                return status.HTTP_200_OK, self.list(resource, query)
+
+            if method == 'POST':
+                return status.HTTP_200_OK, getattr(self, f'create_{resource}')(body)
+
+        elif len(rest) == 1:
+            item = self.get(resource, rest[0])
+
+            if method == 'GET':
+                return status.HTTP_200_OK, item
+
+            if method in ('POST', 'PUT'):
+                return status.HTTP_200_OK, self.update(resource, item, body)
+
+            if method == 'DELETE':
+                item['deleted'] = True
+
+                return status.HTTP_200_OK, {'deleted': True, 'id': item['id']}
+
+        elif len(rest) == 2:
+            item = self.get(resource, rest[0])
+            action = (method, resource, rest[1])
+
+            if action in (('POST', 'customers', 'restore'), ('POST', 'payments', 'restore')):
+                item['deleted'] = False
+
+                return status.HTTP_200_OK, item
+
+            if action == ('GET', 'payments', 'status'):
+                return status.HTTP_200_OK, {'status': item['status']}
+
+            if action == ('POST', 'payments', 'refund'):
+                return status.HTTP_200_OK, self.refund(item, body)
+
+            if action == ('GET', 'subscriptions', 'payments'):
+                return status.HTTP_200_OK, self.list('payments', {**query, 'subscription': item['id']})
+
+        raise FakeError(status.HTTP_404_NOT_FOUND)
+
+    def get(
+        self,
+        resource: str,
+        id: str
+    ) -> dict:
+        item = self.objects.get(resource, {}).get(id)
+
+        if item is None:
+            raise FakeError(status.HTTP_404_NOT_FOUND)
+
+        return item
+
+    def list(
+        self,
+        resource: str,
+        query: dict
+    ) -> dict:
+        offset = int(query.pop('offset', 0))
+        limit = min(int(query.pop('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        include_deleted = query.pop('includeDeleted', None) == 'true'
+        deleted_only = query.pop('deletedOnly', None) == 'true'
+        sort = query.pop('sort', 'dateCreated')
+        order = query.pop('order', 'desc')
+
+        matches = [
+            item for item in self.objects[resource].values()
+            if (item['deleted'] if deleted_only else include_deleted or not item['deleted'])
+            and self.matches(item, query)
+        ]
+        # Newest first, like the API; ids break ties in creation order
+        matches.sort(key=lambda item: (_value(item.get(sort)) or '', item['id']), reverse=order == 'desc')
+
+        return {
+            'object': 'list',
+            'hasMore': offset + limit < len(matches),
+            'totalCount': len(matches),
+            'limit': limit,
+            'offset': offset,
+            'data': matches[offset:offset + limit]
+        }
+
+    def matches(
+        self,
+        item: dict,
+        query: dict
+    ) -> bool:
+        for name, value in query.items():
+            for suffix, compare in RANGE_SUFFIXES:
+                if name.endswith(suffix):
+                    field = _value(item.get(name[:-len(suffix)]))
+
+                    if not compare(field and field[:10], value):
+                        return False
+
+                    break
+
+            else:
+                if name in IGNORED_FILTERS:
+                    continue
+
+                if name == 'name':
+                    if value.lower() not in (item.get('name') or '').lower():
+                        return False
+
+                elif _value(item.get(name)) != value:
+                    return False
+
+        return True
+
+    def update(
+        self,
+        resource: str,
+        item: dict,
+        body: dict
+    ) -> dict:
+        item.update({name: value for name, value in body.items() if name != 'id'})
+
+        if resource == 'payments' and 'value' in body:
+            item['netValue'] = self.net_value(item['value'])
+
+        return item
+
+    def invalid(
+        self,
+        code: str,
+        description: str
+    ) -> FakeError:
+        return FakeError(status.HTTP_400_BAD_REQUEST, code, description)
+
+    def net_value(
+        self,
+        value: float
+    ) -> float:
+        return round(max(value - self.payment_fee, 0), 2)
+
+    def create_customers(
+        self,
+        body: dict
+    ) -> dict:
+        if not body.get('name'):
+            raise self.invalid('invalid_name', 'O nome do cliente deve ser informado.')
+
+        customer = {
+            'object': 'customer',
+            'id': self.new_id('cus'),
+            'dateCreated': self.today().isoformat(),
+            'deleted': False,
+            **body
+        }
+        self.objects['customers'][customer['id']] = customer
+
+        return customer
+
+    def validate_charge(
+        self,
+        body: dict,
+        due_date_field: str
+    ) -> None:
+        customer = self.objects['customers'].get(body.get('customer'))
+
+        if customer is None or customer['deleted']:
+            raise self.invalid('invalid_customer', 'Customer inválido ou não informado.')
+
+        if body.get('billingType') not in tuple(payments.BillingType):
+            raise self.invalid('invalid_billingType', 'Forma de pagamento inválida.')
+
+        if not body.get('value') or body['value'] <= 0:
+            raise self.invalid('invalid_value', 'O valor da cobrança deve ser maior que zero.')
+
+        if not body.get(due_date_field):
+            raise self.invalid('invalid_dueDate', 'A data de vencimento deve ser informada.')
+
+    def create_payments(
+        self,
+        body: dict
+    ) -> dict:
+        self.validate_charge(body, 'dueDate')
+
+        payment = {
+            'object': 'payment',
+            'id': self.new_id('pay'),
+            'dateCreated': self.today().isoformat(),
+            'status': payments.Status.PENDING.value,
+            'netValue': self.net_value(body['value']),
+            'deleted': False,
+            'anticipated': False,
+            'paymentDate': None,
+            'clientPaymentDate': None,
+            **body
+        }
+        self.objects['payments'][payment['id']] = payment
+
+        return payment
+
+    def create_subscriptions(
+        self,
+        body: dict
+    ) -> dict:
+        self.validate_charge(body, 'nextDueDate')
+
+        subscription = {
+            'object': 'subscription',
+            'id': self.new_id('sub'),
+            'dateCreated': self.today().isoformat(),
+            'status': subscriptions.Status.ACTIVE.value,
+            'deleted': False,
+            **body
+        }
+        self.objects['subscriptions'][subscription['id']] = subscription
+
+        # Like the API, the first payment is generated with the subscription
+        self.create_payments({
+            'customer': subscription['customer'],
+            'billingType': subscription['billingType'],
+            'value': subscription['value'],
+            'dueDate': subscription['nextDueDate'],
+            'description': subscription.get('description'),
+            'externalReference': subscription.get('externalReference'),
+            'subscription': subscription['id']
+        })
+
+        return subscription
+
+    def refund(
+        self,
+        payment: dict,
+        body: dict
+    ) -> dict:
+        if payment['status'] not in PAID_STATUSES:
+            raise self.invalid('invalid_action', 'Só é possível estornar cobranças recebidas ou confirmadas.')
+
+        value = body.get('value') or payment['value']
+
+        if value > payment['value']:
+            raise self.invalid('invalid_value', 'O valor do estorno não pode ser maior que o da cobrança.')
+
+        payment['status'] = payments.Status.REFUNDED.value
+        payment['refunds'] = (payment.get('refunds') or []) + [{
+            'dateCreated': self.today().isoformat(),
+            'status': 'DONE',
+            'value': value,
+            'description': body.get('description'),
+            'transactionReceiptUrl': None
+        }]
+
+        return payment
+
+    def receive_payment(
+        self,
+        payment_id: str,
+        payment_date: Optional[date] = None,
+        payment_status: payments.Status = payments.Status.RECEIVED
+    ) -> dict:
+        """Mark a payment as paid, as a customer paying it would"""
+
+        with self._lock:
+            payment = self.get('payments', payment_id)
+            paid_on = (payment_date or self.today()).isoformat()
+            payment.update(status=payment_status.value, paymentDate=paid_on, clientPaymentDate=paid_on)
+
+            return payment
+
+    def overdue_payment(
+        self,
+        payment_id: str
+    ) -> dict:
+        """Mark a pending payment as overdue"""
+
+        with self._lock:
+            payment = self.get('payments', payment_id)
+            payment['status'] = payments.Status.OVERDUE.value
+
+            return payment
+
+    def count(
+        self,
+        method: Optional[str] = None
+    ) -> int:
+        """Requests received so far, optionally only of one method"""
+
+        return self.calls[method] if method is not None else sum(self.calls.values())
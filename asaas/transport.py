@@ -0,0 +1,117 @@
+from asaas.hooks import TimedHTTPAdapter
+
+from typing import (
+    Any,
+    Optional
+)
+
+from abc import (
+    ABC,
+    abstractmethod
+)
+
+import requests
+import threading
+import weakref
+
+
+class Transport(ABC):
+    """Sends the HTTP requests of a client
+
+    A transport returns objects with the interface of requests.Response
+    (status_code, content, headers, url, reason, elapsed, json(),
+    iter_content() and close()), so the client handles them the same way
+    whatever carries them.
+    """
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        params: Optional[dict] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False
+    ) -> Any:
+        """Send a request and return its response"""
+
+    def close(self) -> None:
+        """Release whatever the transport holds"""
+
+
+class RequestsTransport(Transport):
+    """requests over a shared urllib3 connection pool
+
+    A single adapter owns the pool, so every thread and every resource
+    reuses the same keep-alive connections. Sessions are kept per thread
+    because requests.Session is not thread-safe itself; only the thread
+    holds its session strongly, so sessions of finished threads (e.g. the
+    pools of paginate and run_bulk) are freed with them.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False
+    ) -> None:
+        self._adapter = TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self._local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Session bound to the current thread, sharing the connection pool"""
+
+        session = getattr(self._local, 'session', None)
+
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+
+            with self._sessions_lock:
+                self._sessions.add(session)
+
+            self._local.session = session
+
+        return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        params: Optional[dict] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        return self.session.request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            data=data,
+            timeout=timeout,
+            stream=stream
+        )
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+
+        with self._sessions_lock:
+            sessions, self._sessions = list(self._sessions), weakref.WeakSet()
+
+        for session in sessions:
+            session.close()
+
+        self._adapter.close()
+        self._local = threading.local()
@@ -1,3 +1,31 @@
+from typing import Optional
+from datetime import (
+    datetime,
+    timezone
+)
+from email.utils import parsedate_to_datetime
+
 
 def remove_none_and_empty_values(data: dict) -> dict:
     return {k: v for k, v in data.items() if v is not None and v != ''}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a Retry-After header, in seconds or HTTP-date, to seconds"""
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
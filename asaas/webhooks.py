@@ -1,3 +1,50 @@
+from asaas import (
+    ResponseDataToPayment,
+    payments,
+    status
+)
+from asaas.dedup import (
+    BloomDedupStore,
+    MemoryDedupStore,
+    SQLiteDedupStore,
+    dedup_key
+)
+from asaas.json_backend import (
+    JSONBackend,
+    get_backend
+)
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union
+)
+
+import asyncio
+import hmac
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+ACCESS_TOKEN_HEADER = 'asaas-access-token'
+ANY_EVENT = '*'
+
+REASONS = {
+    status.HTTP_200_OK: 'OK',
+    status.HTTP_400_BAD_REQUEST: 'Bad Request',
+    status.HTTP_401_UNAUTHORIZED: 'Unauthorized',
+    status.HTTP_405_METHOD_NOT_ALLOWED: 'Method Not Allowed',
+    status.HTTP_503_SERVICE_UNAVAILABLE: 'Service Unavailable'
+}
+
+
 class Event:
     PAYMENT_CREDIT_CARD_CAPTURE_REFUSED = 'PAYMENT_CREDIT_CARD_CAPTURE_REFUSED'
     PAYMENT_CHECKOUT_VIEWED = 'PAYMENT_CHECKOUT_VIEWED'
@@ -22,3 +69,359 @@ class Event:
     PAYMENT_APPROVED_BY_RISK_ANALYSIS = 'PAYMENT_APPROVED_BY_RISK_ANALYSIS'
     PAYMENT_AWAITING_RISK_ANALYSIS = 'PAYMENT_AWAITING_RISK_ANALYSIS'
     PAYMENT_AUTHORIZED = 'PAYMENT_AUTHORIZED'
+
+
+class WebhookEvent:
+    """A webhook notification, with its payment already converted
+
+    payment is None when the notification has none or it could not be
+    converted; data always holds the notification as received.
+    """
+
+    __slots__ = (
+        'id',
+        'event',
+        'dateCreated',
+        'payment',
+        'data'
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        event: str,
+        dateCreated: Optional[str],
+        payment: Optional[payments.Payment],
+        data: dict
+    ) -> None:
+        self.id = id
+        self.event = event
+        self.dateCreated = dateCreated
+        self.payment = payment
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f'WebhookEvent(id={self.id!r}, event={self.event!r})'
+
+
+class WebhookReceiver(ResponseDataToPayment):
+    """WSGI and ASGI application that receives Asaas webhooks
+
+    Requests must be POSTs carrying the access token configured for the
+    webhook in the asaas-access-token header. A valid notification is
+    acknowledged with 200 as soon as it is queued; registered handlers then
+    run on a pool of worker threads. When the queue is full the receiver
+    answers 503, so Asaas retries later instead of waiting on a slow
+    handler. Events with no handler are acknowledged and dropped.
+
+    With a dedup store, redeliveries of a notification already queued (same
+    event id, or same payment, event and dateCreated) are acknowledged
+    without running the handlers again.
+
+    The receiver itself is the WSGI application; use receiver.asgi for ASGI
+    servers. Handler errors are logged and passed to on_error, if given.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        workers: int = 4,
+        queue_size: int = 1000,
+        asaas: Optional[Any] = None,
+        json_backend: Union[str, JSONBackend] = 'json',
+        on_error: Optional[Callable[[WebhookEvent, Exception], None]] = None,
+        dedup: Optional[Union[MemoryDedupStore, BloomDedupStore, SQLiteDedupStore]] = None
+    ) -> None:
+        self.access_token = access_token.encode()
+        self.asaas = asaas
+        self.dedup = dedup
+        self.json_backend = get_backend(json_backend)
+        self.on_error = on_error
+        self.handlers: Dict[str, List[Callable[[WebhookEvent], None]]] = {}
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.workers = [
+            threading.Thread(target=self._work, name=f'asaas-webhook-{index}', daemon=True)
+            for index in range(workers)
+        ]
+
+        for worker in self.workers:
+            worker.start()
+
+    def on(
+        self,
+        event: str,
+        handler: Optional[Callable[[WebhookEvent], None]] = None
+    ) -> Callable:
+        """Register a handler for an event, or for every event with '*'
+
+        Can be used as a decorator.
+        """
+
+        def register(handler: Callable[[WebhookEvent], None]) -> Callable[[WebhookEvent], None]:
+            self.handlers.setdefault(event, []).append(handler)
+
+            return handler
+
+        return register(handler) if handler is not None else register
+
+    def handlers_for(
+        self,
+        event: str
+    ) -> List[Callable[[WebhookEvent], None]]:
+        return self.handlers.get(event, []) + self.handlers.get(ANY_EVENT, [])
+
+    def receive(
+        self,
+        method: str,
+        headers: Mapping[str, str],
+        body: bytes
+    ) -> int:
+        """Validate and enqueue a notification, returning the HTTP status to answer
+
+        headers must be keyed by lowercase names.
+        """
+
+        if method != 'POST':
+            return status.HTTP_405_METHOD_NOT_ALLOWED
+
+        token = headers.get(ACCESS_TOKEN_HEADER, '').encode()
+
+        if not hmac.compare_digest(token, self.access_token):
+            return status.HTTP_401_UNAUTHORIZED
+
+        try:
+            data = self.json_backend.loads(body)
+            event = data['event']
+
+        except (ValueError, TypeError, KeyError):
+            return status.HTTP_400_BAD_REQUEST
+
+        if not self.handlers_for(event):
+            return status.HTTP_200_OK
+
+        if self.dedup is None:
+            try:
+                self.queue.put_nowait(data)
+
+            except queue.Full:
+                return status.HTTP_503_SERVICE_UNAVAILABLE
+
+            return status.HTTP_200_OK
+
+        key = dedup_key(data)
+
+        if self.dedup.forgets:
+            # add() is atomic, even across processes sharing a SQLite file, so
+            # it is the gate; a key whose event could not be queued is
+            # forgotten, and Asaas's retry after the 503 is processed.
+            if not self.dedup.add(key):
+                return status.HTTP_200_OK
+
+            try:
+                self.queue.put_nowait(data)
+
+            except queue.Full:
+                self.dedup.discard(key)
+
+                return status.HTTP_503_SERVICE_UNAVAILABLE
+
+            return status.HTTP_200_OK
+
+        # Bloom filters cannot forget a key, so it is only recorded once the
+        # event is queued. Concurrent redeliveries may both pass the check, a
+        # trade-off of the fixed-memory store.
+        if self.dedup.contains(key):
+            return status.HTTP_200_OK
+
+        try:
+            self.queue.put_nowait(data)
+
+        except queue.Full:
+            return status.HTTP_503_SERVICE_UNAVAILABLE
+
+        self.dedup.add(key)
+
+        return status.HTTP_200_OK
+
+    def parse(
+        self,
+        data: dict
+    ) -> WebhookEvent:
+        """Build the event of a notification, converting its payment
+
+        A payment that cannot be converted (e.g. missing fields) is logged and
+        passed to on_error, and the event is still built with payment None, so
+        handlers reading event.data keep receiving it.
+        """
+
+        event = WebhookEvent(
+            id=data.get('id'),
+            event=data['event'],
+            dateCreated=data.get('dateCreated'),
+            payment=None,
+            data=data
+        )
+
+        if data.get('payment'):
+            try:
+                event.payment = self.response_data_to_payment(data['payment'])
+
+            except Exception as error:
+                logger.exception('Could not convert the payment of %r', event)
+
+                if self.on_error is not None:
+                    self.on_error(event, error)
+
+        return event
+
+    def dispatch(
+        self,
+        data: dict
+    ) -> None:
+        """Run every handler of a notification, on the calling thread"""
+
+        event = self.parse(data)
+
+        for handler in self.handlers_for(event.event):
+            try:
+                handler(event)
+
+            except Exception as error:
+                logger.exception('Webhook handler %r failed for %r', handler, event)
+
+                if self.on_error is not None:
+                    self.on_error(event, error)
+
+    def _work(self) -> None:
+        while True:
+            data = self.queue.get()
+
+            try:
+                if data is None:
+                    return
+
+                self.dispatch(data)
+
+            except Exception:
+                logger.exception('Invalid webhook notification')
+
+            finally:
+                self.queue.task_done()
+
+    def join(self) -> None:
+        """Wait until every queued notification has been handled"""
+
+        self.queue.join()
+
+    def close(self) -> None:
+        """Handle what is already queued and stop the workers"""
+
+        for _ in self.workers:
+            self.queue.put(None)
+
+        for worker in self.workers:
+            worker.join()
+
+    def response(
+        self,
+        code: int
+    ) -> Tuple[str, List[Tuple[str, str]], bytes]:
+        reason = REASONS[code]
+        body = self.json_backend.dumps({'status': reason})
+        headers = [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body)))
+        ]
+
+        if code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            headers.append(('Retry-After', '1'))
+
+        return f'{code} {reason}', headers, body
+
+    def __call__(
+        self,
+        environ: dict,
+        start_response: Callable
+    ) -> List[bytes]:
+        """WSGI entry point"""
+
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+
+        body = environ['wsgi.input'].read(length) if length else b''
+        headers = {
+            ACCESS_TOKEN_HEADER: environ.get('HTTP_ASAAS_ACCESS_TOKEN', '')
+        }
+
+        status_line, response_headers, response_body = self.response(
+            self.receive(environ['REQUEST_METHOD'], headers, body)
+        )
+        start_response(status_line, response_headers)
+
+        return [response_body]
+
+    async def asgi(
+        self,
+        scope: dict,
+        receive: Callable,
+        send: Callable
+    ) -> None:
+        """ASGI entry point"""
+
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+
+                elif message['type'] == 'lifespan.shutdown':
+                    # close() joins the workers, which must not block the loop
+                    await asyncio.get_running_loop().run_in_executor(None, self.close)
+                    await send({'type': 'lifespan.shutdown.complete'})
+
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        chunks = []
+
+        while True:
+            message = await receive()
+            chunks.append(message.get('body', b''))
+
+            if not message.get('more_body'):
+                break
+
+        headers = {
+            name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope.get('headers', [])
+        }
+        body = b''.join(chunks)
+
+        if isinstance(self.dedup, SQLiteDedupStore):
+            # SQLite may wait on other processes' locks; keep that off the event loop
+            code = await asyncio.get_running_loop().run_in_executor(
+                None, self.receive, scope['method'], headers, body
+            )
+
+        else:
+            code = self.receive(scope['method'], headers, body)
+
+        _, response_headers, response_body = self.response(code)
+
+        await send({
+            'type': 'http.response.start',
+            'status': code,
+            'headers': [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in response_headers
+            ]
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': response_body
+        })
@@ -0,0 +1,470 @@
+"""Requests per second and p50/p99 latency of the client against a local stub API
+
+Starts an HTTP server answering with Asaas-shaped JSON in a separate
+process and times Costumers.retrieve, Payments.create and Payments.list
+(with large pages) sequentially, from a thread pool and, when httpx is
+installed, with AsyncAsaas.
+
+Run from the repository root with ``python -m benchmarks.e2e``. With
+``--output report.json`` the results are also written as JSON, and
+``--compare baseline.json`` exits with status 1 when a p50 got slower than
+the baseline by more than ``--tolerance``.
+"""
+
+from asaas import (
+    Asaas,
+    payments
+)
+
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Tuple
+)
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer
+)
+from urllib.parse import (
+    parse_qs,
+    urlsplit
+)
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import sys
+import time
+
+try:
+    from asaas.aio import AsyncAsaas
+    import httpx
+except ImportError:
+    httpx = None
+
+API_PATH = '/api/v3'
+CUSTOMER_ID = 'cus_000006070645'
+
+CUSTOMER = {
+    'object': 'customer',
+    'id': CUSTOMER_ID,
+    'dateCreated': '2024-06-01',
+    'name': 'John Doe',
+    'email': 'johndoe@email.com',
+    'phone': '8233333333',
+    'mobilePhone': '82999999999',
+    'address': 'Av. Fernandes Lima',
+    'addressNumber': '100',
+    'complement': 'Sala 201',
+    'province': 'Farol',
+    'city': 'Maceió',
+    'state': 'AL',
+    'country': 'Brasil',
+    'postalCode': '57036170',
+    'cpfCnpj': '43883912042',
+    'personType': 'FISICA',
+    'deleted': False,
+    'externalReference': '056984',
+    'notificationDisabled': False
+}
+
+PAYMENT = {
+    'object': 'payment',
+    'id': 'pay_080225913252',
+    'dateCreated': '2024-06-01',
+    'customer': CUSTOMER_ID,
+    'dueDate': '2024-06-30',
+    'value': 129.9,
+    'netValue': 127.41,
+    'billingType': 'PIX',
+    'status': 'PENDING',
+    'description': 'Pedido 056984',
+    'externalReference': '056984',
+    'invoiceUrl': 'https://www.asaas.com/i/080225913252',
+    'bankSlipUrl': 'https://www.asaas.com/b/pdf/080225913252',
+    'invoiceNumber': '00005101',
+    'discount': {'value': 5, 'dueDateLimitDays': 3, 'type': 'PERCENTAGE'},
+    'fine': {'value': 1, 'type': 'PERCENTAGE'},
+    'interest': {'value': 2},
+    'deleted': False,
+    'postalService': False,
+    'anticipated': False,
+    'anticipable': False
+}
+
+SCENARIOS = ('customers.retrieve', 'payments.create', 'payments.list')
+MODES = ('sequential', 'threaded', 'async')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every endpoint the benchmark calls with pre-encoded JSON"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs
+    # add about 40ms to every response
+    disable_nagle_algorithm = True
+    pages: Dict[int, bytes] = {}
+    customer = json.dumps(CUSTOMER).encode()
+    payment = json.dumps(PAYMENT).encode()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def reply(
+        self,
+        code: int,
+        body: bytes
+    ) -> None:
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+
+        if self.headers.get('Connection', '').lower() == 'close':
+            self.send_header('Connection', 'close')
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def page(
+        self,
+        limit: int
+    ) -> bytes:
+        body = self.pages.get(limit)
+
+        if body is None:
+            body = self.pages[limit] = json.dumps({
+                'object': 'list',
+                'hasMore': True,
+                'totalCount': 100000,
+                'limit': limit,
+                'offset': 0,
+                'data': [dict(PAYMENT, id=f'pay_{index:012d}') for index in range(limit)]
+            }).encode()
+
+        return body
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        segments = url.path[len(API_PATH):].strip('/').split('/')
+
+        if segments == ['payments']:
+            limit = int(parse_qs(url.query).get('limit', ['10'])[0])
+            self.reply(200, self.page(limit))
+
+        elif segments[0] == 'customers' and len(segments) == 2:
+            self.reply(200, self.customer)
+
+        else:
+            self.reply(404, b'{}')
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        if self.path.rstrip('/') == f'{API_PATH}/payments':
+            self.reply(200, self.payment)
+
+        else:
+            self.reply(404, b'{}')
+
+
+def serve(ready: 'multiprocessing.Queue') -> None:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_server() -> Tuple[multiprocessing.Process, str]:
+    """Run the stub API in its own process, so it does not compete for the GIL"""
+
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(ready,), daemon=True)
+    process.start()
+
+    return process, f'http://127.0.0.1:{ready.get(timeout=10)}{API_PATH}'
+
+
+def percentile(
+    ordered: List[float],
+    fraction: float
+) -> float:
+    """Nearest-rank percentile of sorted values"""
+
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def summarize(
+    scenario: str,
+    mode: str,
+    latencies: List[float],
+    seconds: float
+) -> dict:
+    ordered = sorted(latencies)
+
+    return {
+        'scenario': scenario,
+        'mode': mode,
+        'calls': len(ordered),
+        'seconds': seconds,
+        'requests_per_second': len(ordered) / seconds,
+        'p50_ms': percentile(ordered, 0.5) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'mean_ms': sum(ordered) / len(ordered) * 1000
+    }
+
+
+def sync_calls(
+    asaas: Asaas,
+    page_size: int
+) -> Dict[str, Callable[[], object]]:
+    return {
+        'customers.retrieve': lambda: asaas.customers.retrieve(CUSTOMER_ID),
+        'payments.create': lambda: asaas.payments.create(
+            customer=CUSTOMER_ID,
+            value=129.9,
+            dueDate=date(2024, 6, 30),
+            billingType=payments.BillingType.PIX,
+            externalReference='056984'
+        ),
+        'payments.list': lambda: asaas.payments.list(limit=page_size)
+    }
+
+
+def async_calls(
+    asaas: 'AsyncAsaas',
+    page_size: int
+) -> Dict[str, Callable[[], Awaitable[object]]]:
+    return {
+        'customers.retrieve': lambda: asaas.customers.retrieve(CUSTOMER_ID),
+        'payments.create': lambda: asaas.payments.create(
+            customer=CUSTOMER_ID,
+            value=129.9,
+            dueDate=date(2024, 6, 30),
+            billingType=payments.BillingType.PIX,
+            externalReference='056984'
+        ),
+        'payments.list': lambda: asaas.payments.list(limit=page_size)
+    }
+
+
+def timed(call: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    call()
+
+    return time.perf_counter() - started
+
+
+def run_sequential(
+    call: Callable[[], object],
+    calls: int
+) -> Tuple[List[float], float]:
+    started = time.perf_counter()
+    latencies = [timed(call) for _ in range(calls)]
+
+    return latencies, time.perf_counter() - started
+
+
+def run_threaded(
+    call: Callable[[], object],
+    calls: int,
+    threads: int
+) -> Tuple[List[float], float]:
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # Start the workers (and their sessions) before the clock does
+        list(executor.map(lambda _: timed(call), range(threads)))
+
+        started = time.perf_counter()
+        latencies = list(executor.map(lambda _: timed(call), range(calls)))
+
+        return latencies, time.perf_counter() - started
+
+
+async def run_async(
+    call: Callable[[], Awaitable[object]],
+    calls: int,
+    concurrency: int
+) -> Tuple[List[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call() -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+
+            return time.perf_counter() - started
+
+    await asyncio.gather(*(timed_call() for _ in range(concurrency)))
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed_call() for _ in range(calls)))
+
+    return list(latencies), time.perf_counter() - started
+
+
+def run_sync_modes(
+    base_url: str,
+    args: argparse.Namespace
+) -> List[dict]:
+    results = []
+
+    with Asaas(
+        api_key='benchmark',
+        pool_connections=args.threads,
+        pool_maxsize=args.threads,
+        keep_alive=args.keep_alive,
+        json_backend=args.json_backend
+    ) as asaas:
+        asaas.base_url = base_url
+
+        for scenario, call in sync_calls(asaas, args.page_size).items():
+            if scenario not in args.scenarios:
+                continue
+
+            for _ in range(args.warmup):
+                call()
+
+            if 'sequential' in args.modes:
+                results.append(summarize(scenario, 'sequential', *run_sequential(call, args.calls)))
+
+            if 'threaded' in args.modes:
+                results.append(summarize(scenario, 'threaded', *run_threaded(call, args.calls, args.threads)))
+
+    return results
+
+
+async def run_async_mode(
+    base_url: str,
+    args: argparse.Namespace
+) -> List[dict]:
+    results = []
+
+    async with AsyncAsaas(
+        api_key='benchmark',
+        max_connections=args.threads,
+        max_keepalive_connections=args.threads if args.keep_alive else 0,
+        json_backend=args.json_backend
+    ) as asaas:
+        asaas.base_url = base_url
+
+        for scenario, call in async_calls(asaas, args.page_size).items():
+            if scenario not in args.scenarios:
+                continue
+
+            for _ in range(args.warmup):
+                await call()
+
+            results.append(summarize(scenario, 'async', *await run_async(call, args.calls, args.threads)))
+
+    return results
+
+
+def compare(
+    results: List[dict],
+    baseline_path: str,
+    tolerance: float
+) -> List[str]:
+    """Scenarios whose p50 is slower than in the baseline report by more than tolerance"""
+
+    with open(baseline_path) as file:
+        baseline = {
+            (result['scenario'], result['mode']): result
+            for result in json.load(file)['results']
+        }
+
+    regressions = []
+
+    for result in results:
+        previous = baseline.get((result['scenario'], result['mode']))
+
+        if previous is not None and result['p50_ms'] > previous['p50_ms'] * (1 + tolerance):
+            regressions.append(
+                f'{result["scenario"]} {result["mode"]}: '
+                f'p50 {previous["p50_ms"]:.3f}ms -> {result["p50_ms"]:.3f}ms'
+            )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=2000, help='timed calls per scenario and mode')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=8, help='workers, connections and async concurrency')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--json-backend', default='json')
+    parser.add_argument('--no-keep-alive', dest='keep_alive', action='store_false', help='a new connection per request')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--url', help='base URL of an already running API, instead of the stub server')
+    parser.add_argument('--output', help='write the report as JSON to this path')
+    parser.add_argument('--compare', metavar='BASELINE', help='report to compare p50 latencies with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed p50 slowdown against the baseline')
+    args = parser.parse_args()
+
+    server, base_url = (None, args.url) if args.url else start_server()
+
+    try:
+        results = run_sync_modes(base_url, args)
+
+        if 'async' in args.modes:
+            if httpx is None:
+                print('async mode skipped: httpx is not installed', file=sys.stderr)
+
+            else:
+                results.extend(asyncio.run(run_async_mode(base_url, args)))
+
+    finally:
+        if server is not None:
+            server.terminate()
+
+    print(
+        f'{args.calls} calls per row, {args.threads} threads/concurrency, '
+        f'page size {args.page_size}, keep-alive {"on" if args.keep_alive else "off"}'
+    )
+    print(f'{"scenario":<20}{"mode":<12}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}')
+
+    for result in sorted(results, key=lambda result: SCENARIOS.index(result['scenario'])):
+        print(
+            f'{result["scenario"]:<20}{result["mode"]:<12}{result["requests_per_second"]:>10.0f}'
+            f'{result["p50_ms"]:>10.3f}{result["p99_ms"]:>10.3f}'
+        )
+
+    report = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'settings': {
+            'calls': args.calls,
+            'warmup': args.warmup,
+            'threads': args.threads,
+            'page_size': args.page_size,
+            'json_backend': args.json_backend,
+            'keep_alive': args.keep_alive,
+            'url': args.url
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+
+        for regression in regressions:
+            print(f'regression: {regression}', file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
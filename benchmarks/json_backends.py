@@ -0,0 +1,94 @@
+"""Decode and encode throughput of the installed JSON backends
+
+Run from the repository root with ``python -m benchmarks.json_backends``.
+"""
+
+from asaas import (
+    json_backend,
+    payments
+)
+from asaas.encoder import AsaasEncoder
+
+from typing import Callable
+
+import argparse
+import json
+import timeit
+
+PAYMENT = {
+    'object': 'payment',
+    'id': 'pay_080225913252',
+    'dateCreated': '2024-06-01',
+    'customer': 'cus_000006070645',
+    'dueDate': '2024-06-30',
+    'value': 129.9,
+    'netValue': 127.41,
+    'billingType': 'PIX',
+    'status': 'PENDING',
+    'description': 'Pedido 056984',
+    'externalReference': '056984',
+    'invoiceUrl': 'https://www.asaas.com/i/080225913252',
+    'bankSlipUrl': 'https://www.asaas.com/b/pdf/080225913252',
+    'invoiceNumber': '00005101',
+    'discount': {'value': 5, 'dueDateLimitDays': 3, 'type': 'PERCENTAGE'},
+    'fine': {'value': 1, 'type': 'PERCENTAGE'},
+    'interest': {'value': 2},
+    'deleted': False,
+    'postalService': False,
+    'anticipated': False,
+    'anticipable': False
+}
+
+
+def best_of(
+    function: Callable[[], object],
+    number: int,
+    repeat: int = 5
+) -> float:
+    """Best time per call, in microseconds"""
+
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    page = {
+        'object': 'list',
+        'hasMore': True,
+        'totalCount': 100000,
+        'limit': args.page_size,
+        'offset': 0,
+        'data': [dict(PAYMENT, id=f'pay_{index:012d}') for index in range(args.page_size)]
+    }
+    body = json.dumps(page).encode()
+    models = [
+        payments.Payment(**dict(
+            PAYMENT,
+            discount=payments.Discount(**PAYMENT['discount']),
+            fine=payments.Fine(**PAYMENT['fine']),
+            interest=payments.Interest(**PAYMENT['interest'])
+        ))
+        for _ in range(args.page_size)
+    ]
+
+    print(f'list page of {args.page_size} payments, {len(body)} bytes; microseconds per page')
+    print(f'{"backend":<12}{"decode":>12}{"encode models":>16}')
+
+    for name in json_backend.available_backends():
+        backend = json_backend.get_backend(name)
+        decode = best_of(lambda: backend.loads(body), args.number)
+        encode = best_of(lambda: backend.dumps(models), args.number)
+
+        print(f'{name:<12}{decode:>12.1f}{encode:>16.1f}')
+
+    encoder = best_of(lambda: json.dumps(models, cls=AsaasEncoder), args.number)
+
+    print(f'{"AsaasEncoder":<12}{"":>12}{encoder:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
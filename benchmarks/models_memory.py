@@ -0,0 +1,140 @@
+"""Bytes per model instance with __slots__ against the previous __dict__ layout
+
+Run from the repository root with ``python -m benchmarks.models_memory``.
+"""
+
+from asaas import (
+    customer,
+    payments,
+    subscriptions
+)
+
+from typing import Callable
+
+import argparse
+import gc
+import tracemalloc
+
+PAYMENT = {
+    'id': 'pay_080225913252',
+    'customer': 'cus_000006070645',
+    'dateCreated': '2024-06-01',
+    'dueDate': '2024-06-30',
+    'value': 129.9,
+    'netValue': 127.41,
+    'billingType': 'PIX',
+    'status': 'PENDING',
+    'description': 'Pedido 056984',
+    'externalReference': '056984',
+    'invoiceUrl': 'https://www.asaas.com/i/080225913252',
+    'bankSlipUrl': 'https://www.asaas.com/b/pdf/080225913252',
+    'invoiceNumber': '00005101',
+    'deleted': False,
+    'postalService': False,
+    'anticipated': False,
+    'anticipable': False
+}
+
+CUSTOMER = {
+    'id': 'cus_000006070645',
+    'dateCreated': '2024-06-01',
+    'name': 'John Doe',
+    'cpfCnpj': '43883912042',
+    'email': 'johndoe@email.com',
+    'mobilePhone': '82999999999',
+    'postalCode': '57036170'
+}
+
+SUBSCRIPTION = {
+    'id': 'sub_VXJBYgP2u0eO',
+    'dateCreated': '2024-06-01',
+    'customer': 'cus_000006070645',
+    'billingType': 'PIX',
+    'cycle': 'MONTHLY',
+    'value': 19.9,
+    'nextDueDate': '2024-07-01',
+    'status': 'ACTIVE',
+    'deleted': False
+}
+
+
+def unslotted(model: type) -> type:
+    """Same constructor as the model, but storing attributes in a __dict__"""
+
+    return type(f'Dict{model.__name__}', (), {'__init__': model.__init__})
+
+
+DictPayment = unslotted(payments.Payment)
+DictDiscount = unslotted(payments.Discount)
+DictFine = unslotted(payments.Fine)
+DictInterest = unslotted(payments.Interest)
+DictCustomer = unslotted(customer.Customer)
+DictSubscription = unslotted(subscriptions.Subscription)
+
+
+def build_payment(
+    payment: type,
+    discount: type,
+    fine: type,
+    interest: type
+):
+    return payment(
+        **PAYMENT,
+        discount=discount(value=5, dueDateLimitDays=3, type='PERCENTAGE'),
+        fine=fine(value=1, type='PERCENTAGE'),
+        interest=interest(value=2)
+    )
+
+
+def bytes_per_object(
+    build: Callable[[], object],
+    count: int
+) -> float:
+    """Average traced allocation per object, excluding the list holding them"""
+
+    objects = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    for index in range(count):
+        objects[index] = build()
+
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    return used / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    cases = {
+        'Payment (with Discount, Fine, Interest)': (
+            lambda: build_payment(DictPayment, DictDiscount, DictFine, DictInterest),
+            lambda: build_payment(payments.Payment, payments.Discount, payments.Fine, payments.Interest)
+        ),
+        'Customer': (
+            lambda: DictCustomer(**CUSTOMER),
+            lambda: customer.Customer(**CUSTOMER)
+        ),
+        'Subscription': (
+            lambda: DictSubscription(**SUBSCRIPTION),
+            lambda: subscriptions.Subscription(**SUBSCRIPTION)
+        )
+    }
+
+    print(f'{"model":<42}{"__dict__":>12}{"__slots__":>12}{"saved":>9}')
+
+    for name, (before, after) in cases.items():
+        before_bytes = bytes_per_object(before, args.count)
+        after_bytes = bytes_per_object(after, args.count)
+        saved = 1 - after_bytes / before_bytes
+
+        print(f'{name:<42}{before_bytes:>12.0f}{after_bytes:>12.0f}{saved:>9.0%}')
+
+
+if __name__ == '__main__':
+    main()
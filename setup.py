@@ -15,6 +15,17 @@ setup(
     install_requires=[
         'requests'
     ],
+    extras_require={
+        'async': [
+            'httpx'
+        ],
+        'fast-json': [
+            'orjson'
+        ],
+        'columnar': [
+            'numpy'
+        ]
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
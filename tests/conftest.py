@@ -0,0 +1,36 @@
+from asaas import (
+    Asaas,
+    payments
+)
+from asaas.testing import FakeAsaas
+
+from datetime import date
+
+import pytest
+
+
+@pytest.fixture
+def fake() -> FakeAsaas:
+    return FakeAsaas()
+
+
+@pytest.fixture
+def asaas(fake: FakeAsaas) -> Asaas:
+    return Asaas(api_key='test', transport=fake)
+
+
+@pytest.fixture
+def customer(asaas: Asaas):
+    return asaas.customers.create(name='Cliente', cpfCnpj='24971563792')
+
+
+def payment_data(
+    customer_id: str,
+    value: float = 10
+) -> dict:
+    return dict(
+        customer=customer_id,
+        value=value,
+        dueDate=date(2024, 1, 1),
+        billingType=payments.BillingType.PIX
+    )
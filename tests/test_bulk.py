@@ -0,0 +1,47 @@
+from asaas import Asaas
+from asaas.bulk import run_bulk
+from asaas.testing import FakeAsaas
+
+from conftest import payment_data
+
+import threading
+
+
+def test_results_in_input_order():
+    results = list(run_bulk(lambda item: item * 2, range(20), concurrency=4))
+
+    assert [result.index for result in results] == list(range(20))
+    assert [result.result for result in results] == [item * 2 for item in range(20)]
+
+
+def test_fail_fast_reports_every_write_sent():
+    fake = FakeAsaas(latency=0.01)
+    asaas = Asaas(api_key='test', transport=fake)
+    customer = asaas.customers.create(name='Cliente', cpfCnpj='24971563792')
+    items = [payment_data('cus_missing' if index == 0 else customer.id) for index in range(50)]
+
+    results = list(asaas.payments.create_many(items, concurrency=4, fail_fast=True))
+
+    assert not results[0].ok
+    assert len(results) < len(items)
+    # Every payment the API created has a result
+    assert sum(result.ok for result in results) == len(fake.objects['payments'])
+
+
+def test_fail_fast_stops_submitting():
+    started = []
+    lock = threading.Lock()
+
+    def work(item: int) -> int:
+        with lock:
+            started.append(item)
+
+        if item == 0:
+            raise ValueError(item)
+
+        return item
+
+    results = list(run_bulk(work, range(100), concurrency=2, fail_fast=True))
+
+    assert len(results) == len(started) < 100
+    assert isinstance(results[0].error, ValueError)
@@ -0,0 +1,70 @@
+from asaas import Asaas
+from asaas.cache import ResourceCache
+from asaas.testing import FakeAsaas
+
+from conftest import payment_data
+
+import threading
+import time
+
+
+def load_in_thread(cache: ResourceCache, key: str, value: str, gate: threading.Event) -> threading.Thread:
+    def load() -> str:
+        gate.wait()
+
+        return value
+
+    thread = threading.Thread(target=cache.get_or_load, args=('payments', key, load))
+    thread.start()
+    # Let the load start before the write it races with
+    time.sleep(0.05)
+
+    return thread
+
+
+def test_load_racing_a_set_is_not_cached():
+    cache = ResourceCache()
+    gate = threading.Event()
+    thread = load_in_thread(cache, 'pay_1', 'old', gate)
+
+    cache.set('payments', 'pay_1', 'new')
+    gate.set()
+    thread.join()
+
+    assert cache.get_or_load('payments', 'pay_1', lambda: 'loaded') == 'new'
+
+
+def test_load_racing_an_invalidate_is_not_cached():
+    cache = ResourceCache()
+    gate = threading.Event()
+    thread = load_in_thread(cache, 'pay_1', 'old', gate)
+
+    cache.invalidate('payments', 'pay_1')
+    gate.set()
+    thread.join()
+
+    assert cache.get_or_load('payments', 'pay_1', lambda: 'fresh') == 'fresh'
+
+
+def test_retrieve_is_cached_and_update_refreshes_it():
+    fake = FakeAsaas()
+    asaas = Asaas(api_key='test', transport=fake, cache=ResourceCache())
+    customer = asaas.customers.create(name='Cliente', cpfCnpj='24971563792')
+    payment = asaas.payments.create(**payment_data(customer.id))
+    gets = fake.count('GET')
+
+    asaas.payments.retrieve(payment.id)
+    asaas.payments.retrieve(payment.id)
+    assert fake.count('GET') == gets + 1
+
+    asaas.payments.update(payment.id, value=20)
+    assert asaas.payments.retrieve(payment.id).value == 20
+
+
+def test_create_does_not_fill_the_cache():
+    cache = ResourceCache()
+    asaas = Asaas(api_key='test', transport=FakeAsaas(), cache=cache)
+    customer = asaas.customers.create(name='Cliente', cpfCnpj='24971563792')
+    asaas.payments.create(**payment_data(customer.id))
+
+    assert cache.stats()['size'] == 0
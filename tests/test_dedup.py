@@ -0,0 +1,122 @@
+from asaas.dedup import (
+    BloomDedupStore,
+    MemoryDedupStore,
+    SQLiteDedupStore,
+    dedup_key
+)
+from asaas.webhooks import WebhookReceiver
+
+import json
+import pytest
+import threading
+
+TOKEN = 'token'
+HEADERS = {'asaas-access-token': TOKEN}
+
+
+def body(event_id: str) -> bytes:
+    return json.dumps({'id': event_id, 'event': 'PAYMENT_CREATED', 'payment': None}).encode()
+
+
+@pytest.fixture(params=['memory', 'bloom', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryDedupStore()
+
+    if request.param == 'bloom':
+        return BloomDedupStore(capacity=1000)
+
+    return SQLiteDedupStore(str(tmp_path / 'dedup.db'))
+
+
+def test_add_records_a_key_once(store):
+    assert store.add('evt_1')
+    assert not store.add('evt_1')
+    assert store.contains('evt_1')
+    assert not store.contains('evt_2')
+
+
+def test_discard_forgets_a_key(store):
+    if not store.forgets:
+        pytest.skip('Bloom filters cannot forget keys')
+
+    store.add('evt_1')
+    store.discard('evt_1')
+
+    assert store.add('evt_1')
+
+
+def test_memory_store_evicts_least_recent():
+    store = MemoryDedupStore(max_size=2)
+
+    for key in ('a', 'b', 'c'):
+        store.add(key)
+
+    assert not store.contains('a')
+    assert len(store) == 2
+
+
+def test_dedup_key_without_event_id():
+    data = {'event': 'PAYMENT_RECEIVED', 'dateCreated': '2024-06-12 10:00:00', 'payment': {'id': 'pay_1'}}
+
+    assert dedup_key(data) == 'pay_1:PAYMENT_RECEIVED:2024-06-12 10:00:00'
+
+
+def test_redelivery_is_handled_once(store):
+    handled = []
+    receiver = WebhookReceiver(TOKEN, workers=1, dedup=store)
+    receiver.on('*', lambda event: handled.append(event.id))
+
+    assert receiver.receive('POST', HEADERS, body('evt_1')) == 200
+    assert receiver.receive('POST', HEADERS, body('evt_1')) == 200
+    receiver.close()
+
+    assert handled == ['evt_1']
+
+
+def test_event_rejected_when_full_is_processed_on_retry(store):
+    if not store.forgets:
+        pytest.skip('Bloom filters cannot forget keys')
+
+    started = threading.Event()
+    gate = threading.Event()
+    handled = []
+    receiver = WebhookReceiver(TOKEN, workers=1, queue_size=1, dedup=store)
+    receiver.on('*', lambda event: (started.set(), gate.wait(), handled.append(event.id)))
+
+    codes = [receiver.receive('POST', HEADERS, body('evt_1'))]
+    started.wait()
+    # evt_1 is being handled, so evt_2 fills the queue
+    codes += [receiver.receive('POST', HEADERS, body(f'evt_{index}')) for index in (2, 3)]
+    gate.set()
+    receiver.join()
+    codes.append(receiver.receive('POST', HEADERS, body('evt_3')))
+    receiver.close()
+
+    assert codes == [200, 200, 503, 200]
+    assert handled == ['evt_1', 'evt_2', 'evt_3']
+
+
+def test_receivers_sharing_a_sqlite_file(tmp_path):
+    path = str(tmp_path / 'dedup.db')
+    handled = []
+    receivers = [WebhookReceiver(TOKEN, workers=1, dedup=SQLiteDedupStore(path)) for _ in range(2)]
+
+    for receiver in receivers:
+        receiver.on('*', lambda event: handled.append(event.id))
+
+    threads = [
+        threading.Thread(target=receiver.receive, args=('POST', HEADERS, body('evt_1')))
+        for receiver in receivers
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    for receiver in receivers:
+        receiver.close()
+
+    assert handled == ['evt_1']
@@ -0,0 +1,50 @@
+from asaas import Asaas
+from asaas.idempotency import (
+    IdempotencyStore,
+    StoredResponse
+)
+from asaas.retry import Retry
+from asaas.testing import FakeAsaas
+
+from conftest import payment_data
+
+
+def test_replayed_key_returns_the_original(asaas: Asaas, fake: FakeAsaas, customer):
+    first = asaas.payments.create(**payment_data(customer.id), idempotency_key='order-1')
+    second = asaas.payments.create(**payment_data(customer.id), idempotency_key='order-1')
+
+    assert second.id == first.id
+    assert len(fake.objects['payments']) == 1
+
+
+def test_generated_keys_are_not_remembered(asaas: Asaas, customer):
+    for _ in range(20):
+        asaas.payments.create(**payment_data(customer.id))
+
+    assert len(asaas.idempotency_store) == 0
+
+
+def test_store_keeps_a_snapshot(asaas: Asaas, customer):
+    payment = asaas.payments.create(**payment_data(customer.id), idempotency_key='order-1')
+    stored = asaas.idempotency_store.get('order-1')
+
+    assert isinstance(stored, StoredResponse)
+    assert stored.to_requests().json()['id'] == payment.id
+
+
+def test_store_evicts_beyond_max_size():
+    store = IdempotencyStore(max_size=2)
+    response = StoredResponse(200, {}, b'{}', 'https://api.asaas.com/v3/payments')
+
+    for key in ('a', 'b', 'c'):
+        store.set(key, response)
+
+    assert len(store) == 2
+    assert store.get('a') is None
+
+
+def test_writes_are_not_retried_by_default():
+    assert not Retry().allows('POST', True)
+    assert Retry().allows('GET')
+    assert Retry(idempotent_writes=True).allows('POST', True)
+    assert not Retry(idempotent_writes=True).allows('POST')
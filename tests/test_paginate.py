@@ -0,0 +1,36 @@
+from asaas import Asaas
+from asaas.testing import FakeAsaas
+
+from conftest import payment_data
+
+import pytest
+
+
+@pytest.fixture
+def payment_ids(asaas: Asaas, customer) -> list:
+    for index in range(250):
+        asaas.payments.create(**payment_data(customer.id, value=1 + index))
+
+    return [payment.id for payment in asaas.payments.iter_all()]
+
+
+@pytest.mark.parametrize('page_size', [10, 100, 500])
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_concurrent_pages_match_serial_scan(asaas: Asaas, payment_ids: list, page_size: int, concurrency: int):
+    found = [payment.id for payment in asaas.payments.iter_all(page_size=page_size, concurrency=concurrency)]
+
+    assert found == payment_ids
+
+
+def test_short_pages_fall_back_to_serial(asaas: Asaas, fake: FakeAsaas, payment_ids: list):
+    list_ = fake.list
+    # An API answering fewer items than asked for must not leave offset gaps
+    fake.list = lambda resource, query: list_(resource, {**query, 'limit': str(min(int(query.get('limit', 10)), 30))})
+
+    found = [payment.id for payment in asaas.payments.iter_all(page_size=100, concurrency=4)]
+
+    assert found == payment_ids
+
+
+def test_iter_all_on_empty_list(asaas: Asaas):
+    assert list(asaas.payments.iter_all(concurrency=4)) == []
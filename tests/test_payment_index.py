@@ -0,0 +1,68 @@
+from asaas import (
+    Asaas,
+    payments
+)
+from asaas.payment_index import PaymentStatusIndex
+
+from conftest import payment_data
+
+import pytest
+
+
+@pytest.fixture
+def payment(asaas: Asaas, customer):
+    return asaas.payments.create(**payment_data(customer.id))
+
+
+@pytest.fixture
+def index(asaas: Asaas, payment) -> PaymentStatusIndex:
+    index = PaymentStatusIndex(asaas)
+    index.seed()
+
+    return index
+
+
+def notification(payment_id: str, event: str, status: str, at: str, reference: str = None) -> dict:
+    return {
+        'event': event,
+        'dateCreated': f'2024-06-12 {at}',
+        'payment': {'id': payment_id, 'status': status, 'externalReference': reference}
+    }
+
+
+def test_seed(index: PaymentStatusIndex, payment):
+    assert len(index) == 1
+    assert index.status(payment.id) == payments.Status.PENDING
+
+
+def test_older_notifications_are_ignored(index: PaymentStatusIndex, payment):
+    index.apply(notification(payment.id, 'PAYMENT_RECEIVED', 'RECEIVED', '10:00:05'))
+    index.apply(notification(payment.id, 'PAYMENT_CONFIRMED', 'CONFIRMED', '10:00:01'))
+
+    assert index.status(payment.id) == payments.Status.RECEIVED
+
+
+def test_same_second_ties_follow_the_lifecycle(index: PaymentStatusIndex, payment):
+    index.apply(notification(payment.id, 'PAYMENT_RECEIVED', 'RECEIVED', '10:00:00'))
+    index.apply(notification(payment.id, 'PAYMENT_CONFIRMED', 'CONFIRMED', '10:00:00'))
+
+    assert index.status(payment.id) == payments.Status.RECEIVED
+
+
+def test_deleted_payment_is_not_resurrected(index: PaymentStatusIndex, payment):
+    index.apply(notification(payment.id, 'PAYMENT_DELETED', 'PENDING', '10:00:09'))
+    index.apply(notification(payment.id, 'PAYMENT_RECEIVED', 'RECEIVED', '10:00:07'))
+
+    assert len(index) == 0
+
+
+def test_references_are_dropped_with_their_payment(index: PaymentStatusIndex, payment):
+    index.apply(notification(payment.id, 'PAYMENT_RECEIVED', 'RECEIVED', '10:00:00', reference='order-1'))
+    assert index.status_by_reference('order-1') == payments.Status.RECEIVED
+
+    index.apply(notification(payment.id, 'PAYMENT_DELETED', 'RECEIVED', '10:00:02'))
+    assert index._references == {}
+
+    index.apply(notification('pay_other', 'PAYMENT_CREATED', 'PENDING', '10:00:03', reference='order-2'))
+    index.discard('pay_other')
+    assert index._references == {}
@@ -0,0 +1,45 @@
+from asaas import Asaas
+from asaas.exceptions import NotFoundAsaas
+from asaas.testing import FakeAsaas
+from asaas.transport import (
+    RequestsTransport,
+    Transport
+)
+
+import gc
+import pytest
+import threading
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()
+
+
+def test_client_without_session(asaas: Asaas):
+    assert asaas.session is None
+
+
+def test_sessions_of_finished_threads_are_released():
+    transport = RequestsTransport()
+
+    for _ in range(50):
+        thread = threading.Thread(target=lambda: transport.session)
+        thread.start()
+        thread.join()
+
+    gc.collect()
+    assert len(transport._sessions) == 0
+
+    transport.session
+    assert len(transport._sessions) == 1
+
+    transport.close()
+    assert len(transport._sessions) == 0
+
+
+def test_fake_errors_raise_like_the_api(asaas: Asaas, fake: FakeAsaas):
+    with pytest.raises(NotFoundAsaas):
+        asaas.payments.retrieve('pay_missing')
+
+    assert fake.count('GET') == 1